@@ -2,41 +2,66 @@
 
 import asyncio
 import importlib
+import time
 
 from pyrogram.types import BotCommand
 from pyrogram import idle
-from pytgcalls.exceptions import NoActiveGroupCall
 
 import config
 from DeadlineTech import LOGGER, app, userbot
 from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import sudo, dbb, heroku
 from DeadlineTech.plugins import ALL_MODULES
+from DeadlineTech.utils.database import load_chat_settings
+from DeadlineTech.utils.stream.relay import stream_relay
+from DeadlineTech.utils.stream.snapshot import queue_snapshots
+from DeadlineTech.utils.ytdlp_pool import ytdlp_pool
 
 from DeadlineTech.plugins.misc.broadcast import start_broadcast_tasks
-from DeadlineTech.plugins.misc.seeker import start_timer_task
 from DeadlineTech.plugins.misc.auto_leave import start_auto_leave_task
 
+async def probe_log_call():
+    try:
+        active = await Anony.probe_log_call()
+    except Exception as e:
+        LOGGER("DeadlineTech").warning(f"Couldn't check the voice chat of the log group: {e}")
+        return
+    if not active:
+        LOGGER("DeadlineTech").error(
+            "turn on the videochat of your log group."
+        )
+        exit()
+
+
 async def init():
 
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
+    if not config.STRING_SESSIONS:
         LOGGER(__name__).error("Assistant client variables not defined, exiting...")
         exit()
     
+    timeline = []
+    started = time.monotonic()
+
+    async def phase(name, coro):
+        begin = time.monotonic()
+        try:
+            return await coro
+        finally:
+            timeline.append(f"{name} {time.monotonic() - begin:.2f}s")
+
     dbb()
     heroku()
     
-    await sudo()
-    
-    await app.start()
+    # The bot, the sudoers list, chat settings and the assistants' connections don't depend on each other
+    await asyncio.gather(
+        phase("sudoers", sudo()),
+        phase("chat settings", load_chat_settings()),
+        phase("bot", app.start()),
+        phase("calls", Anony.start()),
+        phase("stream relay", stream_relay.start()),
+    )
 
-    await app.set_bot_commands([
+    commands = app.set_bot_commands([
         BotCommand("start", "Sᴛᴀʀᴛ's Tʜᴇ Bᴏᴛ"),
         BotCommand("ping", "Cʜᴇᴄᴋ ɪғ ʙᴏᴛ ɪs ᴀʟɪᴠᴇ"),
         BotCommand("help", "Gᴇᴛ Cᴏᴍᴍᴀɴᴅs Lɪsᴛ"),
@@ -64,34 +89,38 @@ async def init():
         BotCommand("reboot", "Reboot bot for individual chat")
     ])
 
+    begin = time.monotonic()
     for all_module in ALL_MODULES:
         importlib.import_module("DeadlineTech.plugins" + all_module)
+    timeline.append(f"plugins {time.monotonic() - begin:.2f}s")
     LOGGER("DeadlineTech.plugins").info("Plugins Imported Successfully...")
+
+    await asyncio.gather(
+        phase("commands", commands),
+        phase("assistants", userbot.start()),
+        phase("log call probe", probe_log_call()),
+    )
     
     LOGGER("DeadlineTech").info("Starting background tasks...")
     start_broadcast_tasks()
-    start_timer_task()
     start_auto_leave_task()
     LOGGER("DeadlineTech").info("Background tasks started successfully")
     
-    await userbot.start()
-    await Anony.start()
-    try:
-        await Anony.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
-    except NoActiveGroupCall:
-        LOGGER("DeadlineTech").error(
-            "turn on the videochat of your log group."
-        )
-        exit()
-    except:
-        pass
     await Anony.decorators()
+    # Rejoins the calls saved before the last shutdown, then keeps saving them
+    queue_snapshots.start()
+    LOGGER("DeadlineTech").info(
+        f"Startup timeline: {' | '.join(timeline)} | total {time.monotonic() - started:.2f}s"
+    )
     LOGGER("DeadlineTech").info(
         "DeadlineTech Music Bot started successfully"
     )
     await idle()
+    await queue_snapshots.close()
+    await stream_relay.close()
     await app.stop()
     await userbot.stop()
+    await ytdlp_pool.close()
     LOGGER("DeadlineTech").info("Stopping DeadlineTech Music Bot...")
 
 if __name__ == "__main__":
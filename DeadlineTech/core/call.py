@@ -11,16 +11,18 @@ from datetime import datetime, timedelta
 from typing import Union
 
 from ntgcalls import ConnectionNotFound, TelegramServerError
-from pyrogram import Client
+from pyrogram.errors import FloodWait, InviteRequestSent, UserAlreadyParticipant, UserNotParticipant
+from pyrogram.raw import functions, types as raw_types
 from pyrogram.types import InlineKeyboardMarkup
 
 from pytgcalls import PyTgCalls, exceptions, types
 from pytgcalls.pytgcalls_session import PyTgCallsSession
 
 import config
-from DeadlineTech import YouTube, app
+from DeadlineTech import YouTube, app, userbot
 from DeadlineTech.logging import LOGGER
 from DeadlineTech.misc import db
+from DeadlineTech.utils.actor import actors
 from DeadlineTech.utils.database import (
     add_active_chat,
     add_active_video_chat,
@@ -28,15 +30,29 @@ from DeadlineTech.utils.database import (
     get_loop,
     group_assistant,
     is_autoend,
+    music_off,
     music_on,
     remove_active_chat,
     remove_active_video_chat,
+    set_calls_assistant,
     set_loop,
 )
 from DeadlineTech.utils.exceptions import AssistantErr
 from DeadlineTech.utils.formatters import check_duration, seconds_to_min, speed_converter
+from DeadlineTech.utils.health import health
 from DeadlineTech.utils.inline.play import stream_markup
+from DeadlineTech.utils.mediastore import media_store
 from DeadlineTech.utils.stream.autoclear import auto_clean
+from DeadlineTech.utils.stream.position import (
+    pause_clock,
+    reset_clock,
+    resume_clock,
+    start_clock,
+    track_position,
+)
+from DeadlineTech.utils.stream.prefetch import prefetcher
+from DeadlineTech.utils.stream.queue import ChatQueue
+from DeadlineTech.utils.stream.relay import stream_relay
 from strings import get_string
 
 autoend = {}
@@ -44,7 +60,8 @@ counter = {}
 
 async def _clear_(chat_id: int):
     LOGGER(__name__).info(f"Clearing active stream data and removing from active chats for: {chat_id}")
-    db[chat_id] = []
+    db[chat_id] = ChatQueue()
+    prefetcher.cancel(chat_id)
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
 
@@ -53,45 +70,15 @@ class Call(PyTgCalls):
         PyTgCallsSession.notice_displayed = True
         LOGGER(__name__).info("PyTgCalls Clients...")
 
-        self.userbot1 = Client(
-            name="DeadlineXAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(self.userbot1, cache_duration=100)
-
-        self.userbot2 = Client(
-            name="DeadlineXAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(self.userbot2, cache_duration=100)
-
-        self.userbot3 = Client(
-            name="DeadlineXAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(self.userbot3, cache_duration=100)
-
-        self.userbot4 = Client(
-            name="DeadlineXAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(self.userbot4, cache_duration=100)
-
-        self.userbot5 = Client(
-            name="DeadlineXAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-        )
-        self.five = PyTgCalls(self.userbot5, cache_duration=100)
+        # One PyTgCalls instance per assistant, on top of the Userbot client
+        # so every assistant keeps a single MTProto connection
+        self.userbots = userbot.clients
+        self.calls = {
+            number: PyTgCalls(client, cache_duration=100)
+            for number, client in self.userbots.items()
+        }
+        # Next-track downloads running off the chat actors
+        self.fetches = set()
 
     def _build_stream(
         self,
@@ -99,6 +86,17 @@ class Call(PyTgCalls):
         video: bool,
         ffmpeg: str | None = None,
     ) -> types.MediaStream:
+        growing = media_store.growing_file(source)
+        if growing and growing.ready.is_set():
+            # File is still being downloaded. The relay streams it as it grows
+            # and ends right after the last byte once the download settles.
+            relayed = stream_relay.url_for(source)
+            if relayed:
+                source = relayed
+            else:
+                follow = f"-follow 1 -rw_timeout {config.PROGRESSIVE_READ_TIMEOUT * 1000000}"
+                ffmpeg = f"{follow} {ffmpeg}" if ffmpeg else follow
+                source = growing.read_path
         return types.MediaStream(
             media_path=source,
             audio_parameters=types.AudioQuality.HIGH,
@@ -112,19 +110,28 @@ class Call(PyTgCalls):
             ffmpeg_parameters=ffmpeg,
         )
 
+    def _number_of(self, client: PyTgCalls) -> int:
+        for number, call in self.calls.items():
+            if call is client:
+                return number
+
     async def _play_on_assistant(
         self,
         client: PyTgCalls,
         chat_id: int,
         stream: types.MediaStream,
+        offset: int = 0,
     ):
+        # offset is where in the file the stream starts (-ss), the queue head's clock restarts from it
         LOGGER(__name__).info(f"Attempting to initiate stream playback in chat: {chat_id}")
+        number = self._number_of(client)
         try:
             await client.play(
                 chat_id=chat_id,
                 stream=stream,
                 config=types.GroupCallConfig(auto_start=False),
             )
+            health.record_success(number)
             LOGGER(__name__).info(f"Successfully started stream in chat: {chat_id}")
         except exceptions.NoActiveGroupCall as e:
             LOGGER(__name__).error(f"Playback failed (NoActiveGroupCall) in {chat_id}: {e}")
@@ -132,25 +139,136 @@ class Call(PyTgCalls):
         except exceptions.NoAudioSourceFound as e:
             LOGGER(__name__).error(f"Playback failed (NoAudioSourceFound) in {chat_id}: {e}")
             raise
-        except ConnectionNotFound as e:
-            LOGGER(__name__).error(f"Playback failed (ConnectionNotFound) in {chat_id}: {e}")
-            raise
-        except TelegramServerError as e:
-            LOGGER(__name__).error(f"Playback failed (TelegramServerError) in {chat_id}: {e}")
-            raise
+        except (ConnectionNotFound, TelegramServerError, FloodWait) as e:
+            LOGGER(__name__).error(f"Playback failed ({type(e).__name__}) in {chat_id}: {e}")
+            if isinstance(e, FloodWait):
+                health.record_flood(number, e.value)
+            else:
+                health.record_failure(number, e)
+            if health.healthy(number):
+                raise
+            client = await self._failover(chat_id, number, stream)
+            if client is None:
+                raise
         except Exception as e:
             LOGGER(__name__).error(f"Unexpected error during playback in {chat_id}: {e}")
             raise
+        playing = db.get(chat_id)
+        if playing:
+            start_clock(playing[0], offset)
+        return client
+
+    async def _current_source(self, track: dict):
+        """Returns what the current track is streamed from and whether it can be seeked."""
+        file = track["file"]
+        video = track["streamtype"] == "video"
+        if track.get("speed_path"):
+            return track["speed_path"], True
+        if "live_" in file:
+            n, link = await YouTube.video(track["vidid"], True)
+            return (link if n else None), False
+        if "vid_" in file:
+            path = media_store.lookup(track["vidid"], video)
+            if not path:
+                path, _ = await YouTube.download(track["vidid"], None, videoid=True, video=video or None)
+            return path, True
+        if "index_" in file:
+            return track["vidid"], False
+        return file, True
+
+    async def _ensure_member(self, number: int, chat_id: int):
+        client = self.userbots[number]
+        try:
+            await app.get_chat_member(chat_id, client.me.id)
+            return
+        except UserNotParticipant:
+            pass
+        invite_link = await app.export_chat_invite_link(chat_id)
+        try:
+            await client.join_chat(invite_link)
+        except InviteRequestSent:
+            await app.approve_chat_join_request(chat_id, client.me.id)
+        except UserAlreadyParticipant:
+            pass
+
+    async def _failover(self, chat_id: int, failed: int, stream: types.MediaStream = None):
+        """
+        Moves a chat off a failing assistant. The new assistant plays `stream` or,
+        without one, resumes the current track at its played position.
+        Returns the new assistant's PyTgCalls instance, None if nothing could take over.
+        """
+        number = await set_calls_assistant(chat_id)
+        if not number or number == failed:
+            LOGGER(__name__).error(f"No healthy assistant left to take over {chat_id}")
+            return None
+        LOGGER(__name__).warning(f"Moving {chat_id} from assistant {failed} to assistant {number}")
+        health.failovers += 1
+        try:
+            await self.calls[failed].leave_call(chat_id, close=False)
+        except Exception:
+            pass
+        client = self.calls[number]
+        played = None
+        try:
+            await self._ensure_member(number, chat_id)
+            if stream is None:
+                playing = db.get(chat_id)
+                if not playing:
+                    return client
+                source, seekable = await self._current_source(playing[0])
+                if not source:
+                    return None
+                played = track_position(playing[0]) if seekable else 0
+                stream = self._build_stream(
+                    source,
+                    video=playing[0]["streamtype"] == "video",
+                    ffmpeg=f"-ss {played}" if seekable and played else None,
+                )
+            await client.play(
+                chat_id=chat_id,
+                stream=stream,
+                config=types.GroupCallConfig(auto_start=False),
+            )
+        except FloodWait as e:
+            health.record_flood(number, e.value)
+            return None
+        except Exception as e:
+            LOGGER(__name__).error(f"Assistant {number} couldn't take over {chat_id}: {e}")
+            health.record_failure(number, e)
+            return None
+        health.record_success(number)
+        if played is not None:
+            start_clock(playing[0], played)
+        return client
+
+    async def _on_assistant(self, chat_id: int, action):
+        # Runs action(assistant) for the chat's assistant, moving the chat if its connection is gone
+        assistant = await group_assistant(self, chat_id)
+        try:
+            return await action(assistant)
+        except (ConnectionNotFound, TelegramServerError) as e:
+            number = self._number_of(assistant)
+            health.record_failure(number, e)
+            if health.healthy(number):
+                raise
+            assistant = await self._failover(chat_id, number)
+            if assistant is None:
+                raise
+            return await action(assistant)
 
     async def pause_stream(self, chat_id: int):
         LOGGER(__name__).info(f"Pausing stream in chat: {chat_id}")
-        assistant = await group_assistant(self, chat_id)
-        await assistant.pause(chat_id)
+        await self._on_assistant(chat_id, lambda assistant: assistant.pause(chat_id))
+        playing = db.get(chat_id)
+        if playing:
+            pause_clock(playing[0])
 
     async def resume_stream(self, chat_id: int):
         LOGGER(__name__).info(f"Resuming stream in chat: {chat_id}")
-        assistant = await group_assistant(self, chat_id)
-        await assistant.resume(chat_id)
+        await self._on_assistant(chat_id, lambda assistant: assistant.resume(chat_id))
+        playing = db.get(chat_id)
+        if playing:
+            resume_clock(playing[0])
 
     async def stop_stream(self, chat_id: int):
         LOGGER(__name__).info(f"Stopping stream and leaving call in chat: {chat_id}")
@@ -161,21 +279,30 @@ class Call(PyTgCalls):
         except Exception as e:
             LOGGER(__name__).warning(f"Failed to gracefully stop stream in {chat_id}: {e}")
 
+    async def force_stop_stream(self, chat_id: int):
+        # Forceplay: only the playing track goes, the rest of the queue stays
+        LOGGER(__name__).info(f"Stopping the current track for forceplay in chat: {chat_id}")
+        assistant = await group_assistant(self, chat_id)
+        queue = db.get(chat_id)
+        if queue:
+            queue.popleft()
+        await remove_active_video_chat(chat_id)
+        await remove_active_chat(chat_id)
+        try:
+            await assistant.leave_call(chat_id, close=False)
+        except Exception:
+            pass
+
     async def stop_stream_force(self, chat_id: int):
         LOGGER(__name__).info(f"Force stopping stream in chat: {chat_id}")
-        for string, client in [
-            (config.STRING1, self.one),
-            (config.STRING2, self.two),
-            (config.STRING3, self.three),
-            (config.STRING4, self.four),
-            (config.STRING5, self.five),
-        ]:
-            if not string:
-                continue
+
+        async def leave(client):
             try:
                 await client.leave_call(chat_id, close=False)
             except Exception:
                 pass
+
+        await asyncio.gather(*(leave(client) for client in self.calls.values()))
         try:
             await _clear_(chat_id)
         except Exception as e:
@@ -234,14 +361,14 @@ class Call(PyTgCalls):
             
         dur = await asyncio.get_event_loop().run_in_executor(None, check_duration, out)
         dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
+        played, con_seconds = speed_converter(track_position(playing[0]), speed)
         duration = seconds_to_min(dur)
         xx = f"-ss {played} -to {duration}"
         video_mode = playing[0]["streamtype"] == "video"
         stream = self._build_stream(out, video=video_mode, ffmpeg=xx)
         
         if str(db[chat_id][0]["file"]) == str(file_path):
-            await self._play_on_assistant(assistant, chat_id, stream)
+            await self._play_on_assistant(assistant, chat_id, stream, offset=con_seconds)
         else:
             LOGGER(__name__).warning(f"Speedup aborted in {chat_id}: Files do not match.")
             raise AssistantErr("Umm")
@@ -251,7 +378,6 @@ class Call(PyTgCalls):
             if not exis:
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
             db[chat_id][0]["dur"] = duration
             db[chat_id][0]["seconds"] = dur
             db[chat_id][0]["speed_path"] = out
@@ -268,8 +394,9 @@ class Call(PyTgCalls):
         assistant = await group_assistant(self, chat_id)
         stream = self._build_stream(link, video=bool(video))
         await self._play_on_assistant(assistant, chat_id, stream)
+        prefetcher.schedule(chat_id)
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, offset: int = 0):
         LOGGER(__name__).info(f"Seeking stream to {to_seek} in chat: {chat_id}")
         assistant = await group_assistant(self, chat_id)
         ffmpeg = f"-ss {to_seek} -to {duration}"
@@ -279,7 +406,7 @@ class Call(PyTgCalls):
             video=video_mode,
             ffmpeg=ffmpeg,
         )
-        await self._play_on_assistant(assistant, chat_id, stream)
+        await self._play_on_assistant(assistant, chat_id, stream, offset=offset)
 
     async def stream_call(self, link):
         LOGGER(__name__).info(f"Initializing generic stream call (Log Group: {config.LOGGER_ID})")
@@ -292,6 +419,21 @@ class Call(PyTgCalls):
         except Exception as e:
             LOGGER(__name__).warning(f"Error leaving stream call in log group: {e}")
 
+    async def probe_log_call(self) -> bool:
+        """Checks that the log group has a voice chat running, without streaming into it."""
+        peer = await app.resolve_peer(config.LOGGER_ID)
+        if isinstance(peer, raw_types.InputPeerChannel):
+            full = await app.invoke(
+                functions.channels.GetFullChannel(
+                    channel=raw_types.InputChannel(
+                        channel_id=peer.channel_id, access_hash=peer.access_hash
+                    )
+                )
+            )
+        else:
+            full = await app.invoke(functions.messages.GetFullChat(chat_id=peer.chat_id))
+        return full.full_chat.call is not None
+
     async def join_call(
         self,
         chat_id: int,
@@ -306,7 +448,7 @@ class Call(PyTgCalls):
         _ = get_string(language)
         stream = self._build_stream(link, video=bool(video))
         try:
-            await self._play_on_assistant(assistant, chat_id, stream)
+            assistant = await self._play_on_assistant(assistant, chat_id, stream)
         except exceptions.NoActiveGroupCall:
             LOGGER(__name__).error(f"Join Call Failed: Voice chat not active in {chat_id}")
             raise AssistantErr(_["call_8"])
@@ -333,14 +475,70 @@ class Call(PyTgCalls):
             except Exception as e:
                 LOGGER(__name__).warning(f"Failed to fetch participants for autoend in {chat_id}: {e}")
 
+    async def restore(self, chat_id: int, queue: ChatQueue, position: int, video: bool, paused: bool):
+        """Rejoins a chat's call after a restart and resumes the head of its saved queue at position."""
+        db[chat_id] = queue
+        track = queue[0]
+        try:
+            source, seekable = await self._current_source(track)
+            if not source:
+                raise AssistantErr("no source")
+            position = position if seekable else 0
+            assistant = await group_assistant(self, chat_id)
+            stream = self._build_stream(
+                source,
+                video=video,
+                ffmpeg=f"-ss {position}" if position else None,
+            )
+            await self._play_on_assistant(assistant, chat_id, stream, offset=position)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Couldn't resume the saved queue of {chat_id}: {e}")
+            await _clear_(chat_id)
+            return False
+
+        await add_active_chat(chat_id)
+        await music_on(chat_id)
+        if video:
+            await add_active_video_chat(chat_id)
+        if paused:
+            await self.pause_stream(chat_id)
+            await music_off(chat_id)
+        prefetcher.schedule(chat_id)
+
+        language = await get_lang(chat_id)
+        _ = get_string(language)
+        try:
+            run = await app.send_message(
+                chat_id=track["chat_id"],
+                text=_["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{track['vidid']}",
+                    track["title"][:23],
+                    track["dur"],
+                    track["by"],
+                ),
+                reply_markup=InlineKeyboardMarkup(stream_markup(_, chat_id)),
+                disable_web_page_preview=True,
+            )
+            track["mystic"] = run.id
+            track["markup"] = "stream"
+        except Exception as e:
+            LOGGER(__name__).warning(f"Could not send the resumed player in {chat_id}: {e}")
+        return True
+
     async def change_stream(self, client: PyTgCalls, chat_id: int):
         LOGGER(__name__).info(f"Stream ended. Processing track change for chat: {chat_id}")
+        # Tracks that fail to start are dropped and the next one is tried
+        while not await self._play_next(client, chat_id):
+            pass
+
+    async def _play_next(self, client: PyTgCalls, chat_id: int) -> bool:
+        """Advances the queue and starts its head, returns False if that track couldn't be played."""
         check = db.get(chat_id)
         popped = None
         loop = await get_loop(chat_id)
         try:
             if loop == 0:
-                popped = check.pop(0)
+                popped = check.popleft()
             else:
                 loop = loop - 1
                 await set_loop(chat_id, loop)
@@ -359,14 +557,15 @@ class Call(PyTgCalls):
                 except Exception as e:
                     LOGGER(__name__).warning(f"Could not send queue empty message in {chat_id}: {e}")
                 
-                return
+                return True
         except Exception as e:
             LOGGER(__name__).error(f"Error managing queue during track change in {chat_id}: {e}")
             try:
                 await _clear_(chat_id)
-                return await client.leave_call(chat_id, close=False)
+                await client.leave_call(chat_id, close=False)
             except Exception:
-                return
+                pass
+            return True
                 
         queued = check[0]["file"]
         language = await get_lang(chat_id)
@@ -376,7 +575,7 @@ class Call(PyTgCalls):
         original_chat_id = check[0]["chat_id"]
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
-        db[chat_id][0]["played"] = 0
+        reset_clock(db[chat_id][0])
         exis = (check[0]).get("old_dur")
         
         if exis:
@@ -386,83 +585,16 @@ class Call(PyTgCalls):
             db[chat_id][0]["speed"] = 1.0
             
         video = True if str(streamtype) == "video" else False
+        prefetcher.schedule(chat_id)
         
         LOGGER(__name__).info(f"Playing next track: {title} in chat: {chat_id}")
         
-        if "live_" in queued:
-            n, link = await YouTube.video(videoid, True)
-            if n == 0:
-                LOGGER(__name__).warning(f"Failed to extract live video URL for {videoid} in {chat_id}")
-                await app.send_message(original_chat_id, text=_["call_6"])
-                return await self.change_stream(client, chat_id)
-                
-            stream = self._build_stream(link, video=video)
-            try:
-                await self._play_on_assistant(client, chat_id, stream)
-            except Exception as e:
-                LOGGER(__name__).error(f"Playback error for live track in {chat_id}: {e}")
-                await app.send_message(original_chat_id, text=_["call_6"])
-                return await self.change_stream(client, chat_id)
-            
-            button = stream_markup(_, chat_id)
-            run = await app.send_message(
-                chat_id=original_chat_id,
-                text=_["stream_1"].format(
-                    f"https://t.me/{app.username}?start=info_{videoid}",
-                    title[:23],
-                    check[0]["dur"],
-                    user,
-                ),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
-            
-        elif "vid_" in queued:
-            mystic = await app.send_message(original_chat_id, _["call_7"])
-            try:
-                file_path, direct = await YouTube.download(
-                    videoid,
-                    mystic,
-                    videoid=True,
-                    video=video,
-                )
-            except Exception as e:
-                LOGGER(__name__).error(f"Download failed for video {videoid} in {chat_id}: {e}")
-                await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
-                return await self.change_stream(client, chat_id)
-                
-            if not file_path:
-                LOGGER(__name__).error(f"Download returned None for {videoid} in {chat_id}")
-                await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
-                return await self.change_stream(client, chat_id)
-                
-            stream = self._build_stream(file_path, video=video)
-            try:
-                await self._play_on_assistant(client, chat_id, stream)
-            except Exception as e:
-                LOGGER(__name__).error(f"Playback error for downloaded track in {chat_id}: {e}")
-                await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
-                return await self.change_stream(client, chat_id)
-            
-            # Send text message instead of photo (thumbnail removed)
-            button = stream_markup(_, chat_id)
-            await mystic.delete()
-            run = await app.send_message(
-                chat_id=original_chat_id,
-                text=_["stream_1"].format(
-                    f"https://t.me/{app.username}?start=info_{videoid}",
-                    title[:23],
-                    check[0]["dur"],
-                    user,
-                ),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-            
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
+        if "live_" in queued or "vid_" in queued:
+            # Resolving or downloading can take minutes, it runs off the actor
+            # so /skip, /stop and the player buttons aren't stuck behind it
+            fetch = asyncio.create_task(self._fetch_next(client, chat_id, check[0], _))
+            self.fetches.add(fetch)
+            fetch.add_done_callback(self.fetches.discard)
 
         elif "index_" in queued:
             stream = self._build_stream(videoid, video=video)
@@ -471,7 +603,7 @@ class Call(PyTgCalls):
             except Exception as e:
                 LOGGER(__name__).error(f"Playback error for index track in {chat_id}: {e}")
                 await app.send_message(original_chat_id, text=_["call_6"])
-                return await self.change_stream(client, chat_id)
+                return False
                 
             button = stream_markup(_, chat_id)
             run = await app.send_message(
@@ -480,7 +612,7 @@ class Call(PyTgCalls):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             
         else:
@@ -490,7 +622,7 @@ class Call(PyTgCalls):
             except Exception as e:
                 LOGGER(__name__).error(f"Playback error for direct track in {chat_id}: {e}")
                 await app.send_message(original_chat_id, text=_["call_6"])
-                return await self.change_stream(client, chat_id)
+                return False
                 
             button = stream_markup(_, chat_id)
             if videoid == "telegram" or videoid == "soundcloud":
@@ -502,7 +634,7 @@ class Call(PyTgCalls):
                     reply_markup=InlineKeyboardMarkup(button),
                     disable_web_page_preview=True
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             else:
                 run = await app.send_message(
@@ -516,53 +648,97 @@ class Call(PyTgCalls):
                     reply_markup=InlineKeyboardMarkup(button),
                     disable_web_page_preview=True
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "stream"
+        return True
+
+    async def _fetch_next(self, client: PyTgCalls, chat_id: int, track, _):
+        """Gets the source of a queued youtube or live track, then starts it on the chat's actor."""
+        queued = track["file"]
+        videoid = track["vidid"]
+        mystic = None
+        source = None
+        try:
+            if "live_" in queued:
+                n, link = await YouTube.video(videoid, True)
+                if n == 0:
+                    LOGGER(__name__).warning(f"Failed to extract live video URL for {videoid} in {chat_id}")
+                else:
+                    source = link
+            else:
+                mystic = await app.send_message(track["chat_id"], _["call_7"])
+                source, direct = await YouTube.download(
+                    videoid,
+                    mystic,
+                    videoid=True,
+                    video=str(track["streamtype"]) == "video",
+                    progressive=True,
+                )
+                if not source:
+                    LOGGER(__name__).error(f"Download returned None for {videoid} in {chat_id}")
+        except Exception as e:
+            LOGGER(__name__).error(f"Fetching {videoid} failed in {chat_id}: {e}")
+        actors.post(chat_id, self._start_fetched, client, chat_id, track, source, mystic, _)
+
+    async def _start_fetched(self, client: PyTgCalls, chat_id: int, track, source, mystic, _):
+        check = db.get(chat_id)
+        if not check or check[0] is not track:
+            # Skipped or stopped while it was being fetched
+            if mystic:
+                try:
+                    await mystic.delete()
+                except Exception:
+                    pass
+            return
+        live = "live_" in track["file"]
+        if source:
+            stream = self._build_stream(source, video=str(track["streamtype"]) == "video")
+            try:
+                await self._play_on_assistant(client, chat_id, stream)
+            except Exception as e:
+                LOGGER(__name__).error(f"Playback error for {'live' if live else 'downloaded'} track in {chat_id}: {e}")
+                source = None
+        if not source:
+            if mystic:
+                await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
+            else:
+                await app.send_message(track["chat_id"], text=_["call_6"])
+            # Drop it and move on, like any other track that fails to start
+            return await self.change_stream(client, chat_id)
+
+        if mystic:
+            await mystic.delete()
+        button = stream_markup(_, chat_id)
+        run = await app.send_message(
+            chat_id=track["chat_id"],
+            text=_["stream_1"].format(
+                f"https://t.me/{app.username}?start=info_{track['vidid']}",
+                track["title"].title()[:23],
+                track["dur"],
+                track["by"],
+            ),
+            reply_markup=InlineKeyboardMarkup(button),
+            disable_web_page_preview=True
+        )
+        track["mystic"] = run.id
+        track["markup"] = "tg" if live else "stream"
 
     async def ping(self):
-        pings = []
-        if config.STRING1:
-            pings.append(self.one.ping)
-        if config.STRING2:
-            pings.append(self.two.ping)
-        if config.STRING3:
-            pings.append(self.three.ping)
-        if config.STRING4:
-            pings.append(self.four.ping)
-        if config.STRING5:
-            pings.append(self.five.ping)
+        pings = [client.ping for client in self.calls.values()]
         return str(round(sum(pings) / len(pings), 3)) if pings else "0"
 
     async def start(self):
         LOGGER(__name__).info("Starting PyTgCalls Clients...\n")
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        await asyncio.gather(*(client.start() for client in self.calls.values()))
 
     async def decorators(self):
-        for string, client in [
-            (config.STRING1, self.one),
-            (config.STRING2, self.two),
-            (config.STRING3, self.three),
-            (config.STRING4, self.four),
-            (config.STRING5, self.five),
-        ]:
-            if not string:
-                continue
-            
+        for client in self.calls.values():
             @client.on_update()
             async def _update_handler(client_instance, update: types.Update):
                 if isinstance(update, types.StreamEnded):
                     if update.stream_type == types.StreamEnded.Type.AUDIO:
                         LOGGER(__name__).info(f"StreamEnded Event received for chat: {update.chat_id}")
-                        await self.change_stream(client_instance, update.chat_id)
+                        actors.post(update.chat_id, self.change_stream, client_instance, update.chat_id)
                 elif isinstance(update, types.ChatUpdate):
                     if update.status in [
                         types.ChatUpdate.Status.KICKED,
@@ -570,6 +746,6 @@ class Call(PyTgCalls):
                         types.ChatUpdate.Status.CLOSED_VOICE_CHAT,
                     ]:
                         LOGGER(__name__).warning(f"Assistant ChatUpdate Status [{update.status}] received. Stopping stream in {update.chat_id}")
-                        await self.stop_stream(update.chat_id)
+                        actors.post(update.chat_id, self.stop_stream, update.chat_id)
 
 Anony = Call()
@@ -6,6 +6,9 @@
 # ==========================================================
 
 
+import asyncio
+from typing import Dict, Optional
+
 from pyrogram import Client
 import config
 from ..logging import LOGGER
@@ -16,48 +19,29 @@ assistantids = []
 
 class Userbot(Client):
     def __init__(self):
-        self.one = Client(
-            name="DeadlineXAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-            no_updates=True,
-        )
-        self.two = Client(
-            name="DeadlineXAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-            no_updates=True,
-        )
-        self.three = Client(
-            name="DeadlineXAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-            no_updates=True,
-        )
-        self.four = Client(
-            name="DeadlineXAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-            no_updates=True,
-        )
-        self.five = Client(
-            name="DeadlineXAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-            no_updates=True,
-        )
+        # Assistant number -> client, one per STRING_SESSION* variable.
+        # PyTgCalls (core/call.py) runs on these same clients, so they need updates.
+        self.clients: Dict[int, Client] = {
+            number: Client(
+                name=f"DeadlineXAss{number}",
+                api_id=config.API_ID,
+                api_hash=config.API_HASH,
+                session_string=str(session),
+            )
+            for number, session in config.STRING_SESSIONS.items()
+        }
+
+    def get(self, number: int) -> Optional[Client]:
+        return self.clients.get(int(number))
 
     async def start(self):
         LOGGER(__name__).info("Starting clients...")
 
         async def setup_assistant(client, number):
             try:
-                await client.start()
+                # Already connected when PyTgCalls started it first
+                if not client.is_connected:
+                    await client.start()
                 await client.join_chat("ArcBotz")
                 await client.join_chat("ArcUpdates")
             except Exception:
@@ -81,31 +65,19 @@ class Userbot(Client):
 
             LOGGER(__name__).info(f"🤖 Assistant {number} is active")
 
-        if config.STRING1:
-            await setup_assistant(self.one, 1)
-        if config.STRING2:
-            await setup_assistant(self.two, 2)
-        if config.STRING3:
-            await setup_assistant(self.three, 3)
-        if config.STRING4:
-            await setup_assistant(self.four, 4)
-        if config.STRING5:
-            await setup_assistant(self.five, 5)
+        await asyncio.gather(
+            *(setup_assistant(client, number) for number, client in self.clients.items())
+        )
+        assistants.sort()
 
         LOGGER(__name__).info("Clients Started Successfully.")
 
     async def stop(self):
         LOGGER(__name__).info("Shutting down assistant clients...")
-        try:
-            if config.STRING1:
-                await self.one.stop()
-            if config.STRING2:
-                await self.two.stop()
-            if config.STRING3:
-                await self.three.stop()
-            if config.STRING4:
-                await self.four.stop()
-            if config.STRING5:
-                await self.five.stop()
-        except Exception as e:
-            LOGGER(__name__).warning(f"⚠️ Error while stopping assistants: {e}")
+        results = await asyncio.gather(
+            *(client.stop() for client in self.clients.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER(__name__).warning(f"⚠️ Error while stopping assistants: {result}")
@@ -41,8 +41,8 @@ XCB = [
 
 def dbb():
     """Initialize local database (called for logging purposes)."""
-    global db
-    db = {}
+    # Clear in place, modules hold a reference to this dict from import time
+    db.clear()
     LOGGER(__name__).info(f"Local DB Created Successfully")
 
 
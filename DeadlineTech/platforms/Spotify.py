@@ -5,29 +5,30 @@
 # ❤️ Openly built for the community, but proudly protected by the passion of its creators.
 # ==========================================================
 
+import asyncio
 import re
+import time
+from typing import List, Optional
 
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
-from youtubesearchpython.__future__ import VideosSearch
+import aiohttp
 
 import config
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.database import get_spotify_videos, save_spotify_video
 
 
 class SpotifyAPI:
+    api = "https://api.spotify.com/v1"
+    token_url = "https://accounts.spotify.com/api/token"
+
     def __init__(self):
         self.regex = r"^(https:\/\/open.spotify.com\/)(.*)$"
         self.client_id = config.SPOTIFY_CLIENT_ID
         self.client_secret = config.SPOTIFY_CLIENT_SECRET
-        if config.SPOTIFY_CLIENT_ID and config.SPOTIFY_CLIENT_SECRET:
-            self.client_credentials_manager = SpotifyClientCredentials(
-                self.client_id, self.client_secret
-            )
-            self.spotify = spotipy.Spotify(
-                client_credentials_manager=self.client_credentials_manager
-            )
-        else:
-            self.spotify = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -35,54 +36,138 @@ class SpotifyAPI:
         else:
             return False
 
-    async def track(self, link: str):
-        track = self.spotify.track(link)
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=20, sock_connect=10)
+            )
+        return self._session
+
+    async def _get_token(self) -> str:
+        # Client credentials tokens last an hour, every request shares the cached one
+        if self._token and time.monotonic() < self._token_expires:
+            return self._token
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires:
+                return self._token
+            session = await self._get_session()
+            async with session.post(
+                self.token_url,
+                data={"grant_type": "client_credentials"},
+                auth=aiohttp.BasicAuth(self.client_id, self.client_secret),
+            ) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+            self._token = data["access_token"]
+            self._token_expires = time.monotonic() + data.get("expires_in", 3600) - 60
+            return self._token
+
+    async def _get(self, url: str, params: dict = None) -> dict:
+        if not url.startswith("https://"):
+            url = f"{self.api}/{url}"
+        session = await self._get_session()
+        for attempt in range(3):
+            headers = {"Authorization": f"Bearer {await self._get_token()}"}
+            async with session.get(url, params=params, headers=headers) as resp:
+                if resp.status == 401:
+                    self._token = None
+                    continue
+                if resp.status == 429:
+                    await asyncio.sleep(min(int(resp.headers.get("Retry-After", 1)), 10))
+                    continue
+                resp.raise_for_status()
+                return await resp.json()
+        raise RuntimeError(f"Spotify request failed: {url}")
+
+    async def _items(self, page: dict, limit: int) -> list:
+        items = list(page.get("items") or [])
+        while page.get("next") and len(items) < limit:
+            page = await self._get(page["next"])
+            items.extend(page.get("items") or [])
+        return items[:limit]
+
+    @staticmethod
+    def _id(link: str, kind: str) -> str:
+        # Accepts open.spotify.com links, spotify:<kind>:<id> uris and bare ids
+        match = re.search(rf"{kind}[/:]([A-Za-z0-9]+)", link)
+        return match.group(1) if match else link.strip()
+
+    @staticmethod
+    def _query(track: dict) -> str:
         info = track["name"]
         for artist in track["artists"]:
             fetched = f' {artist["name"]}'
             if "Various Artists" not in fetched:
                 info += fetched
-        results = VideosSearch(info, limit=1)
-        for result in (await results.next())["result"]:
-            ytlink = result["link"]
-            title = result["title"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
-        }
-        return track_details, vidid
+        return info
+
+    async def _search(self, track: dict) -> Optional[dict]:
+        from DeadlineTech import YouTube
+
+        query = self._query(track)
+        try:
+            details, vidid = await YouTube.track(query)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to map spotify track {query}: {e}")
+            return None
+        if not vidid:
+            return None
+        isrc = (track.get("external_ids") or {}).get("isrc")
+        await save_spotify_video(track["id"], isrc, vidid, details["title"], details["duration_min"])
+        return details
+
+    async def _map(self, tracks: List[dict]) -> List[str]:
+        """
+        Matches every track to a youtube video and returns them in order, as watch
+        links when found (so stream() gets them from the search cache) and as the
+        plain search text otherwise. Stored matches are used without searching.
+        """
+        from DeadlineTech import YouTube
+
+        tracks = [t for t in tracks if t and t.get("id") and t.get("name")]
+        known = await get_spotify_videos(
+            [(t["id"], (t.get("external_ids") or {}).get("isrc")) for t in tracks]
+        )
+        semaphore = asyncio.Semaphore(config.PLAYLIST_RESOLVE_CONCURRENCY)
+
+        async def resolve(track):
+            entry = known.get(track["id"])
+            if entry and not entry["stale"]:
+                YouTube.remember(entry["vidid"], entry["title"], entry["duration"])
+                return YouTube.base + entry["vidid"]
+            async with semaphore:
+                details = await self._search(track)
+            if details:
+                return details["link"]
+            if entry:
+                # Couldn't refresh a stale match, it's still better than nothing
+                YouTube.remember(entry["vidid"], entry["title"], entry["duration"])
+                return YouTube.base + entry["vidid"]
+            return self._query(track)
+
+        return await asyncio.gather(*(resolve(t) for t in tracks))
+
+    async def track(self, link: str):
+        from DeadlineTech import YouTube
+
+        track = await self._get(f"tracks/{self._id(link, 'track')}")
+        mapped = await self._map([track])
+        if not mapped:
+            return None, None
+        return await YouTube.track(mapped[0])
 
     async def playlist(self, url):
-        playlist = self.spotify.playlist(url)
+        playlist = await self._get(f"playlists/{self._id(url, 'playlist')}")
         playlist_id = playlist["id"]
-        results = []
-        for item in playlist["tracks"]["items"]:
-            music_track = item["track"]
-            info = music_track["name"]
-            for artist in music_track["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        items = await self._items(playlist["tracks"], config.PLAYLIST_FETCH_LIMIT)
+        results = await self._map([item.get("track") for item in items])
         return results, playlist_id
 
     async def album(self, url):
-        album = self.spotify.album(url)
+        album = await self._get(f"albums/{self._id(url, 'album')}")
         album_id = album["id"]
-        results = []
-        for item in album["tracks"]["items"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        items = await self._items(album["tracks"], config.PLAYLIST_FETCH_LIMIT)
+        results = await self._map(items)
 
         return (
             results,
@@ -90,16 +175,8 @@ class SpotifyAPI:
         )
 
     async def artist(self, url):
-        artistinfo = self.spotify.artist(url)
-        artist_id = artistinfo["id"]
-        results = []
-        artisttoptracks = self.spotify.artist_top_tracks(url)
-        for item in artisttoptracks["tracks"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f' {artist["name"]}'
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
+        artist_id = self._id(url, "artist")
+        artisttoptracks = await self._get(f"artists/{artist_id}/top-tracks", {"market": "US"})
+        results = await self._map(artisttoptracks["tracks"][: config.PLAYLIST_FETCH_LIMIT])
 
         return results, artist_id
@@ -4,8 +4,6 @@ import re
 import uuid
 import aiohttp
 import aiofiles
-import yt_dlp
-from pathlib import Path
 from urllib.parse import urlparse, unquote
 from typing import Union, Optional, Dict, Any, Tuple
 
@@ -14,8 +12,13 @@ from pyrogram.enums import MessageEntityType
 
 from youtubesearchpython.__future__ import VideosSearch
 from DeadlineTech import app as TG_APP
-from DeadlineTech.utils.database import is_on_off
-from DeadlineTech.utils.formatters import time_to_seconds
+from DeadlineTech.utils.database import get_query_video, is_on_off, save_query_video
+from DeadlineTech.utils.formatters import seconds_to_min, time_to_seconds
+from DeadlineTech.utils.cache import MISSING, TTLCache
+from DeadlineTech.utils.downloader import RangedDownloader
+from DeadlineTech.utils.mediastore import media_store
+from DeadlineTech.utils.singleflight import SingleFlight
+from DeadlineTech.utils.ytdlp_pool import ytdlp_pool
 from DeadlineTech.logging import LOGGER
 import config
 
@@ -35,6 +38,10 @@ ALLOWED_DOMAINS = {
 JOB_POLL_ATTEMPTS = 15     
 JOB_POLL_INTERVAL = 2.0    
 JOB_POLL_BACKOFF = 1.2     
+JOB_POLL_MAX_INTERVAL = 8.0
+JOB_POLL_CONCURRENCY = 10
+# Same overall patience as the old per-download loop of JOB_POLL_ATTEMPTS backed off polls
+JOB_POLL_TIMEOUT = JOB_POLL_INTERVAL * (JOB_POLL_BACKOFF ** JOB_POLL_ATTEMPTS - 1) / (JOB_POLL_BACKOFF - 1)
 HARD_TIMEOUT = 80          
 
 V2_HTTP_RETRIES = 5
@@ -43,6 +50,18 @@ NO_CANDIDATE_WAIT = 4
 CDN_RETRIES = 5
 CDN_RETRY_DELAY = 2
 
+# Concurrent downloads of the same (video id, audio/video, format) share one job
+download_flight = SingleFlight("youtube-download")
+# Database writes that shouldn't hold up a reply, referenced until they finish
+_background_writes = set()
+
+SEARCH_LIMIT = 10
+NEGATIVE_SEARCH_TTL = 300
+
+# Search results shared by details/title/duration/track/slider, keyed by video id or query text
+meta_cache = TTLCache(config.YT_META_CACHE_SIZE, config.YT_META_CACHE_TTL, NEGATIVE_SEARCH_TTL)
+search_flight = SingleFlight("youtube-search")
+
 
 def is_safe_url(text: str) -> bool:
     if not text: return False
@@ -81,6 +100,17 @@ def extract_safe_id(link: str) -> Optional[str]:
     except: pass
     return None
 
+def _normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _meta_entry(r: dict) -> dict:
+    return {
+        "id": r.get("id", ""),
+        "title": r.get("title", "Unknown"),
+        "duration": r.get("duration", "0:00"),
+        "link": r.get("link"),
+    }
+
 def cookie_txt_file():
     """Returns the hardcoded path to cookies/cookies.txt"""
     cookie_path = os.path.join(os.getcwd(), "cookies", "cookies.txt")
@@ -105,6 +135,15 @@ async def get_http_session() -> aiohttp.ClientSession:
         _session = aiohttp.ClientSession(timeout=timeout, connector=connector)
         return _session
 
+cdn_downloader = RangedDownloader(
+    get_http_session,
+    retries=CDN_RETRIES,
+    retry_delay=CDN_RETRY_DELAY,
+    chunk_size=CHUNK_SIZE,
+    connections=config.CDN_CONNECTIONS,
+    parallel_min_size=config.CDN_PARALLEL_MIN_SIZE,
+)
+
 def _looks_like_status_text(s: Optional[str]) -> bool:
     if not s: return False
     low = s.lower()
@@ -133,6 +172,139 @@ def _extract_candidate(obj: Any) -> Optional[str]:
             if v: return _extract_candidate(v)
     return None
 
+class _PendingJob:
+    __slots__ = ("future", "interval", "next_poll", "deadline", "polls")
+
+    def __init__(self, future: asyncio.Future, now: float):
+        self.future = future
+        self.interval = JOB_POLL_INTERVAL
+        self.next_poll = now + JOB_POLL_INTERVAL
+        self.deadline = now + JOB_POLL_TIMEOUT
+        self.polls = 0
+
+
+class JobTracker:
+    """
+    Polls all pending v2 API jobs from a single loop instead of one loop per download.
+
+    Every job backs off on its own schedule, but the loop wakes up once for all jobs that
+    are due (or nearly due), starts a poll for each of them and resolves each waiter as
+    soon as its candidate URL shows up. Polls run as their own tasks, so a slow one only
+    holds back its own job.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, _PendingJob] = {}
+        self.wakeup = asyncio.Event()
+        self.semaphore = asyncio.Semaphore(JOB_POLL_CONCURRENCY)
+        self._task: Optional[asyncio.Task] = None
+        self.inflight: Dict[str, asyncio.Task] = {}
+        self.polls = 0
+        self.rounds = 0
+        self.resolved = 0
+        self.failed = 0
+        self.expired = 0
+
+    async def wait(self, job_id: str) -> Optional[str]:
+        job = self.jobs.get(job_id)
+        if job is None:
+            loop = asyncio.get_running_loop()
+            job = self.jobs[job_id] = _PendingJob(loop.create_future(), loop.time())
+            self.wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            if self.jobs.get(job_id) is job and not job.future.done():
+                job.future.cancel()
+                del self.jobs[job_id]
+            raise
+
+    def _finish(self, job_id: str, candidate: Optional[str]):
+        job = self.jobs.pop(job_id, None)
+        if job and not job.future.done():
+            job.future.set_result(candidate)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.jobs:
+            self.wakeup.clear()
+            idle = [job for job_id, job in self.jobs.items() if job_id not in self.inflight]
+            if not idle:
+                # Every job has a poll running, the first one to finish wakes us
+                await self.wakeup.wait()
+                continue
+            now = loop.time()
+            delay = min(job.next_poll for job in idle) - now
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            now = loop.time()
+            # Jobs due within the next half interval ride along, so polls stay grouped
+            due = [
+                job_id for job_id, job in self.jobs.items()
+                if job_id not in self.inflight and job.next_poll - job.interval / 2 <= now
+            ]
+            self.rounds += 1
+            for job_id in due:
+                task = self.inflight[job_id] = asyncio.create_task(self._poll(job_id))
+                task.add_done_callback(lambda _, job_id=job_id: self._polled(job_id))
+
+    def _polled(self, job_id: str):
+        self.inflight.pop(job_id, None)
+        self.wakeup.set()
+
+    async def _poll(self, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        api_url = getattr(config, "API_URL", None)
+        status_url = f"{api_url.rstrip('/')}/youtube/jobStatus"
+        try:
+            async with self.semaphore:
+                self.polls += 1
+                session = await get_http_session()
+                async with session.get(status_url, params={"job_id": job_id}) as resp:
+                    if resp.status == 200:
+                        data = await resp.json()
+                        candidate = _extract_candidate(data)
+                        if candidate and not _looks_like_status_text(candidate):
+                            self.resolved += 1
+                            return self._finish(job_id, candidate)
+                        job_data = data.get("job", {}) if isinstance(data, dict) else {}
+                        if job_data.get("status") == "error":
+                            LOGGER(__name__).error(f"❌ Job Error: {job_data.get('error')}")
+                            self.failed += 1
+                            return self._finish(job_id, None)
+        except Exception:
+            pass
+        now = asyncio.get_running_loop().time()
+        job.polls += 1
+        if now >= job.deadline:
+            LOGGER(__name__).warning(f"⌛ Job {job_id} still pending after {job.polls} polls, giving up")
+            self.expired += 1
+            return self._finish(job_id, None)
+        job.interval = min(job.interval * JOB_POLL_BACKOFF, JOB_POLL_MAX_INTERVAL)
+        job.next_poll = min(now + job.interval, job.deadline)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self.jobs),
+            "inflight": len(self.inflight),
+            "polls": self.polls,
+            "rounds": self.rounds,
+            "resolved": self.resolved,
+            "failed": self.failed,
+            "expired": self.expired,
+        }
+
+
+job_tracker = JobTracker()
+
 def _normalize_url(candidate: str) -> Optional[str]:
     api_url = getattr(config, "API_URL", None)
     if not api_url or not candidate: return None
@@ -143,46 +315,45 @@ def _normalize_url(candidate: str) -> Optional[str]:
         return f"{api_url.rstrip('/')}{c}"
     return f"{api_url.rstrip('/')}/{c.lstrip('/')}"
 
+def _is_streamable(head: bytes) -> bool:
+    # An mp4/m4a can only be played while downloading if its index (moov) or
+    # fragments come before the media data, walk the top level boxes to check.
+    offset = 0
+    while offset + 8 <= len(head):
+        size = int.from_bytes(head[offset:offset + 4], "big")
+        box = head[offset + 4:offset + 8]
+        if box in (b"moov", b"moof"):
+            return True
+        if box == b"mdat":
+            return False
+        if size == 1 and offset + 16 <= len(head):
+            size = int.from_bytes(head[offset + 8:offset + 16], "big")
+        if size < 8:
+            return False
+        offset += size
+    return False
+
 async def _download_cdn(url: str, out_path: str) -> bool:
     LOGGER(__name__).info(f"🔗 Downloading from CDN: {url}")
-    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    
-    for attempt in range(1, CDN_RETRIES + 1):
-        try:
-            session = await get_http_session()
-            async with session.get(url, timeout=HARD_TIMEOUT) as resp:
-                if resp.status != 200:
-                    if attempt < CDN_RETRIES:
-                        await asyncio.sleep(CDN_RETRY_DELAY)
-                        continue
-                    return False
-
-                async with aiofiles.open(out_path, "wb") as f:
-                    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
-                        if not chunk: break
-                        await f.write(chunk)
-            
-            if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
-                return True
-
-        except asyncio.TimeoutError:
-            if attempt < CDN_RETRIES: await asyncio.sleep(CDN_RETRY_DELAY)
-        except Exception as e:
-            LOGGER(__name__).error(f"CDN Fail: {e}")
-            if attempt < CDN_RETRIES: await asyncio.sleep(CDN_RETRY_DELAY)
-    
-    return False
+    growing = media_store.growing_file(out_path)
+    on_progress = None
+    if growing:
+        # A growing file is read front to back while downloading, so keep it to one sequential connection
+        def on_progress(written: int):
+            if not growing.ready.is_set() and written >= config.PROGRESSIVE_MIN_BYTES:
+                growing.ready.set()
+    return await cdn_downloader.fetch(url, out_path, on_progress=on_progress)
 
 async def v2_download_process(link: str, video: bool) -> Optional[str]:
     # This is primarily kept for AUDIO downloads as requested
     vid = extract_safe_id(link) or link 
     file_id = extract_safe_id(link) or uuid.uuid4().hex[:10]
     
-    ext = "mp4" if video else "m4a"
-    out_path = Path("downloads/video" if video else "downloads/audio") / f"{file_id}.{ext}"
+    out_path = media_store.path_for(file_id, video)
 
-    if out_path.exists() and out_path.stat().st_size > 0:
-        return str(out_path)
+    cached = media_store.lookup(file_id, video)
+    if cached:
+        return cached
 
     api_key = getattr(config, "API_KEY", None)
     api_url = getattr(config, "API_URL", None)
@@ -213,28 +384,7 @@ async def v2_download_process(link: str, video: bool) -> Optional[str]:
 
             if job_id and not candidate:
                 LOGGER(__name__).info(f"⏳ Polling Job: {job_id}")
-                interval = JOB_POLL_INTERVAL
-                
-                for _ in range(JOB_POLL_ATTEMPTS):
-                    await asyncio.sleep(interval)
-                    status_url = f"{api_url.rstrip('/')}/youtube/jobStatus"
-                    
-                    try:
-                        async with session.get(status_url, params={"job_id": job_id}) as s_resp:
-                            if s_resp.status == 200:
-                                s_data = await s_resp.json()
-                                candidate = _extract_candidate(s_data)
-                                if candidate and not _looks_like_status_text(candidate):
-                                    break
-                                
-                                job_data = s_data.get("job", {}) if isinstance(s_data, dict) else {}
-                                if job_data.get("status") == "error":
-                                    LOGGER(__name__).error(f"❌ Job Error: {job_data.get('error')}")
-                                    break
-                    except Exception:
-                        pass
-                    
-                    interval *= JOB_POLL_BACKOFF
+                candidate = await job_tracker.wait(str(job_id))
             
             if not candidate:
                 if cycle < V2_DOWNLOAD_CYCLES: await asyncio.sleep(NO_CANDIDATE_WAIT); continue
@@ -246,7 +396,7 @@ async def v2_download_process(link: str, video: bool) -> Optional[str]:
                  return None
 
             if await _download_cdn(final_url, str(out_path)):
-                return str(out_path)
+                return media_store.add(out_path) or str(out_path)
         
         except Exception as e:
             LOGGER(__name__).error(f"API Cycle Error: {e}")
@@ -254,27 +404,14 @@ async def v2_download_process(link: str, video: bool) -> Optional[str]:
     
     return None
 
-def _run_ytdlp(link: str, out_path: str, cookie_file: str, format_id: str = None):
-    # Synchronous function mapped into a thread pool
-    ydl_opts = {
-        'format': format_id if format_id else 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-        'outtmpl': out_path,
-        'cookiefile': cookie_file,
-        'quiet': True,
-        'no_warnings': True,
-    }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        ydl.download([link])
-    return True
-
-async def yt_dlp_download_video(link: str, format_id: str = None) -> Optional[str]:
+async def yt_dlp_download_video(link: str, format_id: str = None, lane: str = "interactive") -> Optional[str]:
     vid = extract_safe_id(link) or uuid.uuid4().hex[:10]
-    out_dir = Path("downloads/video")
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / f"{vid}.mp4"
-    
-    if out_path.exists() and out_path.stat().st_size > 0:
-        return str(out_path)
+    out_path = media_store.path_for(vid, True, format_id)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cached = media_store.lookup(vid, True, format_id)
+    if cached:
+        return cached
 
     cookie_file = cookie_txt_file()
     if not cookie_file:
@@ -283,15 +420,14 @@ async def yt_dlp_download_video(link: str, format_id: str = None) -> Optional[st
 
     try:
         LOGGER(__name__).info(f"Downloading VIDEO via yt-dlp: {vid} (Cookies: {os.path.basename(cookie_file)})")
-        loop = asyncio.get_event_loop()
-        # Add timeout to prevent infinite hang - 5 minute timeout for video downloads
-        await asyncio.wait_for(
-            loop.run_in_executor(None, _run_ytdlp, link, str(out_path), cookie_file, format_id),
-            timeout=300 
+        # 5 minute timeout for video downloads, the worker is killed once it's exceeded
+        await ytdlp_pool.run(
+            lane, "download", timeout=300,
+            link=link, out_path=str(out_path), cookie_file=cookie_file, format_id=format_id,
         )
         
         if out_path.exists() and out_path.stat().st_size > 0:
-            return str(out_path)
+            return media_store.add(out_path) or str(out_path)
     except asyncio.TimeoutError:
         LOGGER(__name__).error(f"yt-dlp Video Download TIMEOUT (5 min exceeded) for: {vid}")
         # Clean up partial file
@@ -332,35 +468,59 @@ class YouTubeAPI:
                         return entity.url
         return None
 
+    async def _search(self, link: str) -> list:
+        vid = extract_safe_id(link)
+        key = ("id", vid) if vid else ("q", _normalize_query(link))
+        cached = meta_cache.get(key)
+        if cached is not MISSING:
+            return cached or []
+        return await search_flight.do(key, self._resolve, key, link)
+
+    async def _resolve(self, key: tuple, link: str) -> list:
+        # A free text search fetches a full page so slider() is served from the same result
+        results = VideosSearch(link, limit=1 if key[0] == "id" else SEARCH_LIMIT)
+        res_list = [_meta_entry(r) for r in (await results.next()).get("result") or []]
+        for r in res_list:
+            if r["id"]:
+                meta_cache.set(("id", r["id"]), [r])
+        meta_cache.set(key, res_list or None)
+        return res_list
+
+    def remember(self, vidid: str, title: str, duration: str):
+        """Seeds the search cache with a video that is already known from elsewhere."""
+        meta_cache.set(("id", vidid), [_meta_entry({
+            "id": vidid,
+            "title": title,
+            "duration": duration,
+            "link": self.base + vidid,
+        })])
+
     async def details(self, link: str, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
         if "&" in link: link = link.split("&")[0]
         
         if not is_safe_url(link): return "Unsafe URL", "0", 0, "", ""
         
-        results = VideosSearch(link, limit=1)
-        res_list = (await results.next()).get("result", [])
+        res_list = await self._search(link)
         
         if res_list:
             r = res_list[0]
-            sec = int(time_to_seconds(r.get("duration", "0:00"))) if r.get("duration") else 0
+            sec = int(time_to_seconds(r["duration"])) if r["duration"] else 0
             # Return empty string for thumbnail
-            return r.get("title", "Unknown"), r.get("duration", "0:00"), sec, "", r.get("id", "")
+            return r["title"], r["duration"], sec, "", r["id"]
             
         return None
 
     async def title(self, link: str, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
-        results = VideosSearch(link, limit=1)
-        res_list = (await results.next()).get("result", [])
-        if res_list: return res_list[0].get("title", "Unknown")
+        res_list = await self._search(link)
+        if res_list: return res_list[0]["title"]
         return ""
 
     async def duration(self, link: str, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
-        results = VideosSearch(link, limit=1)
-        res_list = (await results.next()).get("result", [])
-        if res_list: return res_list[0].get("duration", "0:00")
+        res_list = await self._search(link)
+        if res_list: return res_list[0]["duration"] or "0:00"
         return "00:00"
 
     async def thumbnail(self, link: str, videoid: Union[bool, str] = None):
@@ -383,63 +543,60 @@ class YouTubeAPI:
         cookie_file = cookie_txt_file()
         if not cookie_file: return []
         
-        cmd = [
-            "yt-dlp", "-i", "--get-id", "--flat-playlist", "--cookies", cookie_file,
-            "--playlist-end", str(limit), "--skip-download", "--", link
-        ]
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            entries = await ytdlp_pool.run(
+                "playlist", "playlist", timeout=60, link=link, cookie_file=cookie_file, limit=limit
             )
-            # Add timeout to prevent infinite wait
-            stdout, _ = await asyncio.wait_for(
-                proc.communicate(),
-                timeout=60 
-            )
-            if stdout: return [x for x in stdout.decode().split("\n") if x]
         except asyncio.TimeoutError:
             LOGGER(__name__).warning(f"yt-dlp playlist fetch timeout for {link}")
-            try:
-                proc.kill()
-            except:
-                pass
+            return []
         except Exception as e:
             LOGGER(__name__).error(f"yt-dlp error: {e}")
-        return []
+            return []
+
+        # The flat listing already carries title and duration, seed the search cache
+        # so queueing the playlist doesn't search every entry again
+        for e in entries:
+            if e["title"] and e["duration"]:
+                self.remember(e["id"], e["title"], seconds_to_min(e["duration"]))
+        return [e["id"] for e in entries]
 
     async def track(self, link: str, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
-        results = VideosSearch(link, limit=1)
-        res_list = (await results.next()).get("result", [])
+        query = None if re.search(self.regex, link) else _normalize_query(link)
+        if query:
+            stored = await get_query_video(query)
+            if stored:
+                if ("id", stored["vidid"]) not in meta_cache:
+                    self.remember(stored["vidid"], stored["title"], stored["duration"])
+                return {
+                    "title": stored["title"],
+                    "link": self.base + stored["vidid"],
+                    "vidid": stored["vidid"],
+                    "duration_min": stored["duration"],
+                    "thumb": "",
+                }, stored["vidid"]
+
+        res_list = await self._search(link)
         
         if res_list:
             r = res_list[0]
+            if query and r["id"]:
+                # Saved in the background so a slow Mongo doesn't delay /play
+                write = asyncio.create_task(save_query_video(query, r["id"], r["title"], r["duration"]))
+                _background_writes.add(write)
+                write.add_done_callback(_background_writes.discard)
             # Safely fetch dict values and return an empty string for the thumbnail
             return {
-                "title": r.get("title", "Unknown"), 
-                "link": r.get("link", link), 
-                "vidid": r.get("id", ""),
-                "duration_min": r.get("duration", "0:00"), 
+                "title": r["title"], 
+                "link": r["link"] or link, 
+                "vidid": r["id"],
+                "duration_min": r["duration"], 
                 "thumb": "", 
-            }, r.get("id", "")
+            }, r["id"]
             
         return None, None
 
-    def _run_ytdlp_formats(link: str, cookie_file: str):
-        """Synchronous helper to extract format info."""
-        ytdl_opts = {"quiet": True, "cookiefile": cookie_file}
-        out = []
-        with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
-            r = ydl.extract_info(link, download=False)
-            for f in r.get("formats", []):
-                if "dash" in str(f.get("format")).lower(): continue
-                out.append({
-                    "format": f.get("format"), "filesize": f.get("filesize"),
-                    "format_id": f.get("format_id"), "ext": f.get("ext"),
-                    "format_note": f.get("format_note"), "yturl": link
-                })
-        return out
-
     async def formats(self, link: str, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
         if not is_safe_url(link): return [], link
@@ -448,11 +605,8 @@ class YouTubeAPI:
         if not cookie_file: return [], link
         
         try:
-            # Run in executor with timeout to prevent blocking
-            loop = asyncio.get_event_loop()
-            out = await asyncio.wait_for(
-                loop.run_in_executor(None, self._run_ytdlp_formats, link, cookie_file),
-                timeout=60
+            out = await ytdlp_pool.run(
+                "interactive", "formats", timeout=60, link=link, cookie_file=cookie_file
             )
             return out, link
         except asyncio.TimeoutError:
@@ -464,15 +618,45 @@ class YouTubeAPI:
 
     async def slider(self, link: str, query_type: int, videoid: Union[bool, str] = None):
         if videoid: link = self.base + link
-        a = VideosSearch(link, limit=10)
-        result = (await a.next()).get("result")
+        result = await self._search(link)
         
         if not result or query_type >= len(result): 
             return None, None, "", None
             
         r = result[query_type]
         # Return empty string for the thumbnail
-        return r.get("title", "Unknown"), r.get("duration", "0:00"), "", r.get("id", "")
+        return r["title"], r["duration"], "", r["id"]
+
+    async def _download_progressive(self, key: tuple, link: str) -> Optional[str]:
+        """
+        Returns the audio path as soon as enough leading bytes are on disk,
+        the rest of the download keeps running in the background.
+        """
+        out_path = str(media_store.path_for(key[0], False))
+        growing = media_store.expect(out_path, RangedDownloader.part_path(out_path))
+        if growing.task is None:
+            growing.task = asyncio.ensure_future(
+                download_flight.do(key, v2_download_process, link, video=False)
+            )
+            growing.task.add_done_callback(lambda _: media_store.settle(out_path))
+
+        ready = asyncio.ensure_future(growing.ready.wait())
+        try:
+            await asyncio.wait({growing.task, ready}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready.cancel()
+
+        if not growing.task.done():
+            try:
+                async with aiofiles.open(growing.read_path, "rb") as f:
+                    head = await f.read(config.PROGRESSIVE_MIN_BYTES)
+            except OSError:
+                head = b""
+            if _is_streamable(head):
+                LOGGER(__name__).info(f"▶️ Starting playback of {out_path} while the download continues")
+                return out_path
+            # Index sits at the end of the file, nothing to gain from starting early
+        return await asyncio.shield(growing.task)
 
     async def download(
         self,
@@ -484,6 +668,8 @@ class YouTubeAPI:
         songvideo: Union[bool, str] = None,
         format_id: Union[bool, str] = None,
         title: Union[bool, str] = None,
+        progressive: bool = False,
+        lane: str = "interactive",
     ) -> Tuple[Optional[str], Optional[bool]]:
         if videoid: link = self.base + link
         
@@ -491,11 +677,16 @@ class YouTubeAPI:
             return None, None
 
         is_vid = True if (video or songvideo) else False
-        
+        # One flight per output file: only video downloads honour format_id,
+        # and each format has its own file
+        key = (extract_safe_id(link) or link, "video" if is_vid else "audio", (format_id if is_vid else None) or "best")
+
         if is_vid:
-            path = await yt_dlp_download_video(link, format_id=format_id)
+            path = await download_flight.do(key, yt_dlp_download_video, link, format_id=format_id, lane=lane)
+        elif progressive and config.PROGRESSIVE_PLAYBACK and extract_safe_id(link):
+            path = await self._download_progressive(key, link)
         else:
-            path = await v2_download_process(link, video=False)
+            path = await download_flight.do(key, v2_download_process, link, video=False)
 
         if path:
             return path, True
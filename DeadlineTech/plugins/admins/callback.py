@@ -9,6 +9,7 @@ import config
 from DeadlineTech import YouTube, app
 from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import SUDOERS, db
+from DeadlineTech.utils.actor import serialized
 from DeadlineTech.utils.database import (
     get_active_chats,
     get_lang,
@@ -25,6 +26,7 @@ from DeadlineTech.utils.decorators.language import languageCB
 from DeadlineTech.utils.formatters import seconds_to_min
 from DeadlineTech.utils.inline import close_markup, stream_markup, stream_markup_timer
 from DeadlineTech.utils.stream.autoclear import auto_clean
+from DeadlineTech.utils.stream.position import reset_clock
 from config import (
     BANNED_USERS,
     adminlist,
@@ -39,6 +41,7 @@ upvoters = {}
 
 @app.on_callback_query(filters.regex("ADMIN") & ~BANNED_USERS)
 @languageCB
+@serialized(lambda client, query, _: int(query.data.split(None, 1)[1].split("|")[1].split("_")[0]))
 async def del_back_playlist(client, CallbackQuery, _):
     callback_data = CallbackQuery.data.strip()
     callback_request = callback_data.split(None, 1)[1]
@@ -168,7 +171,7 @@ async def del_back_playlist(client, CallbackQuery, _):
             txt = f"⏭ **Track Skipped**\n╰ By: {mention}"
             popped = None
             try:
-                popped = check.pop(0)
+                popped = check.popleft()
                 if popped:
                     await auto_clean(popped)
                 if not check:
@@ -206,7 +209,7 @@ async def del_back_playlist(client, CallbackQuery, _):
         streamtype = check[0]["streamtype"]
         videoid = check[0]["vidid"]
         status = True if str(streamtype) == "video" else None
-        db[chat_id][0]["played"] = 0
+        reset_clock(db[chat_id][0])
         exis = (check[0]).get("old_dur")
         
         if exis:
@@ -238,7 +241,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
             
@@ -252,6 +255,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                     mystic,
                     videoid=True,
                     video=status,
+                    progressive=True,
                 )
             except:
                 return await mystic.edit_text(_["call_6"])
@@ -272,7 +276,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
             await mystic.delete()
@@ -289,7 +293,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
             
@@ -308,7 +312,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                     reply_markup=InlineKeyboardMarkup(button),
                     disable_web_page_preview=True
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "tg"
             else:
                 button = stream_markup(_, chat_id)
@@ -322,7 +326,7 @@ async def del_back_playlist(client, CallbackQuery, _):
                     reply_markup=InlineKeyboardMarkup(button),
                     disable_web_page_preview=True
                 )
-                db[chat_id][0]["mystic"] = run
+                db[chat_id][0]["mystic"] = run.id
                 db[chat_id][0]["markup"] = "stream"
             await CallbackQuery.edit_message_text(txt, reply_markup=close_markup(_))
 
@@ -8,6 +8,7 @@ from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import db
 from DeadlineTech.utils import AdminRightsCheck, seconds_to_min
 from DeadlineTech.utils.inline import close_markup
+from DeadlineTech.utils.stream.position import track_position
 from config import BANNED_USERS
 
 
@@ -30,7 +31,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
     if duration_seconds == 0:
         return await message.reply_text(_["admin_22"])
     file_path = playing[0]["file"]
-    duration_played = int(playing[0]["played"])
+    duration_played = track_position(playing[0])
     duration_to_skip = int(query)
     duration = playing[0]["dur"]
     
@@ -67,15 +68,11 @@ async def seek_comm(cli, message: Message, _, chat_id):
             seconds_to_min(to_seek),
             duration,
             playing[0]["streamtype"],
+            offset=to_seek,
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
         
-    if "back" in message.command[0]:
-        db[chat_id][0]["played"] -= duration_to_skip
-    else:
-        db[chat_id][0]["played"] += duration_to_skip
-        
     await mystic.edit_text(
         text=_["admin_25"].format(seconds_to_min(to_seek), message.from_user.mention),
         reply_markup=close_markup(_),
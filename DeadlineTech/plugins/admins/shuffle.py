@@ -1,7 +1,5 @@
 # Powered By Team DeadlineTech
 
-import random
-
 from pyrogram import filters
 from pyrogram.types import Message
 
@@ -9,6 +7,7 @@ from DeadlineTech import app
 from DeadlineTech.misc import db
 from DeadlineTech.utils.decorators import AdminRightsCheck
 from DeadlineTech.utils.inline import close_markup
+from DeadlineTech.utils.stream.prefetch import prefetcher
 from config import BANNED_USERS
 
 
@@ -20,16 +19,10 @@ async def admins(Client, message: Message, _, chat_id):
     check = db.get(chat_id)
     if not check:
         return await message.reply_text(_["queue_2"])
-    try:
-        popped = check.pop(0)
-    except:
-        return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
-    check = db.get(chat_id)
-    if not check:
-        check.insert(0, popped)
+    if len(check) < 2:
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
-    random.shuffle(check)
-    check.insert(0, popped)
+    check.shuffle_upcoming()
+    prefetcher.schedule(chat_id)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
@@ -11,6 +11,7 @@ from DeadlineTech.utils.database import get_loop
 from DeadlineTech.utils.decorators import AdminRightsCheck
 from DeadlineTech.utils.inline import close_markup, stream_markup
 from DeadlineTech.utils.stream.autoclear import auto_clean
+from DeadlineTech.utils.stream.position import reset_clock
 from config import BANNED_USERS
 
 
@@ -32,27 +33,21 @@ async def skip(cli, message: Message, _, chat_id):
                 if count > 2:
                     count = int(count - 1)
                     if 1 <= state <= count:
-                        for x in range(state):
-                            popped = None
+                        for popped in check.skip(state):
+                            await auto_clean(popped)
+                        if not check:
                             try:
-                                popped = check.pop(0)
+                                await message.reply_text(
+                                    text=_["admin_6"].format(
+                                        message.from_user.mention,
+                                        message.chat.title,
+                                    ),
+                                    reply_markup=close_markup(_),
+                                )
+                                await Anony.stop_stream(chat_id)
                             except:
-                                return await message.reply_text(_["admin_12"])
-                            if popped:
-                                await auto_clean(popped)
-                            if not check:
-                                try:
-                                    await message.reply_text(
-                                        text=_["admin_6"].format(
-                                            message.from_user.mention,
-                                            message.chat.title,
-                                        ),
-                                        reply_markup=close_markup(_),
-                                    )
-                                    await Anony.stop_stream(chat_id)
-                                except:
-                                    return
-                                break
+                                pass
+                            return
                     else:
                         return await message.reply_text(_["admin_11"].format(count))
                 else:
@@ -65,7 +60,7 @@ async def skip(cli, message: Message, _, chat_id):
         check = db.get(chat_id)
         popped = None
         try:
-            popped = check.pop(0)
+            popped = check.popleft()
             if popped:
                 await auto_clean(popped)
             if not check:
@@ -97,7 +92,7 @@ async def skip(cli, message: Message, _, chat_id):
     streamtype = check[0]["streamtype"]
     videoid = check[0]["vidid"]
     status = True if str(streamtype) == "video" else None
-    db[chat_id][0]["played"] = 0
+    reset_clock(db[chat_id][0])
     exis = (check[0]).get("old_dur")
     if exis:
         db[chat_id][0]["dur"] = exis
@@ -124,7 +119,7 @@ async def skip(cli, message: Message, _, chat_id):
             reply_markup=InlineKeyboardMarkup(button),
             disable_web_page_preview=True
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "tg"
         
     elif "vid_" in queued:
@@ -135,6 +130,7 @@ async def skip(cli, message: Message, _, chat_id):
                 mystic,
                 videoid=True,
                 video=status,
+                progressive=True,
             )
         except:
             return await mystic.edit_text(_["call_6"])
@@ -153,7 +149,7 @@ async def skip(cli, message: Message, _, chat_id):
             reply_markup=InlineKeyboardMarkup(button),
             disable_web_page_preview=True
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "stream"
         await mystic.delete()
         
@@ -168,7 +164,7 @@ async def skip(cli, message: Message, _, chat_id):
             reply_markup=InlineKeyboardMarkup(button),
             disable_web_page_preview=True
         )
-        db[chat_id][0]["mystic"] = run
+        db[chat_id][0]["mystic"] = run.id
         db[chat_id][0]["markup"] = "tg"
         
     else:
@@ -186,7 +182,7 @@ async def skip(cli, message: Message, _, chat_id):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "tg"
         else:
             run = await message.reply_text(
@@ -199,5 +195,5 @@ async def skip(cli, message: Message, _, chat_id):
                 reply_markup=InlineKeyboardMarkup(button),
                 disable_web_page_preview=True
             )
-            db[chat_id][0]["mystic"] = run
+            db[chat_id][0]["mystic"] = run.id
             db[chat_id][0]["markup"] = "stream"
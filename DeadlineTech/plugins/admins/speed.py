@@ -6,6 +6,7 @@ from pyrogram.types import Message
 from DeadlineTech import app
 from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import SUDOERS, db
+from DeadlineTech.utils.actor import serialized
 from DeadlineTech.utils import AdminRightsCheck
 from DeadlineTech.utils.database import is_active_chat, is_nonadmin_chat
 from DeadlineTech.utils.decorators.language import languageCB
@@ -40,6 +41,7 @@ async def playback(cli, message: Message, _, chat_id):
 
 @app.on_callback_query(filters.regex("SpeedUP") & ~BANNED_USERS)
 @languageCB
+@serialized(lambda client, query, _: int(query.data.split(None, 1)[1].split("|")[0]))
 async def del_back_playlist(client, CallbackQuery, _):
     callback_data = CallbackQuery.data.strip()
     callback_request = callback_data.split(None, 1)[1]
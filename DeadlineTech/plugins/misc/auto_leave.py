@@ -7,7 +7,8 @@ from pyrogram.enums import ChatType
 from pyrogram.errors import FloodWait
 
 import config
-from DeadlineTech.utils.database import get_client, is_active_chat
+from DeadlineTech.utils.activecalls import active_calls
+from DeadlineTech.utils.database import get_client
 from DeadlineTech.logging import LOGGER
 
 LOG = LOGGER(__name__)
@@ -68,7 +69,7 @@ async def leave_inactive_chats(client, client_num: int) -> None:
                 continue
 
             # Check Database for activity
-            if not await is_active_chat(chat.id):
+            if chat.id not in active_calls:
                 try:
                     await client.leave_chat(chat.id)
                     LOG.info(f"Assistant {client_num} left inactive chat: {chat.title} [{chat.id}]")
@@ -0,0 +1,30 @@
+# Powered By Team DeadlineTech
+
+from pyrogram import filters
+from pyrogram.types import Message
+
+from DeadlineTech import app
+from DeadlineTech.misc import SUDOERS
+from DeadlineTech.utils.placement import placement
+
+
+@app.on_message(filters.command(["assistants", "placement"]) & SUDOERS)
+async def assistant_distribution(_, message: Message):
+    rows = await placement.distribution()
+    if not rows:
+        return await message.reply_text("❌ No assistants are running.")
+    text = (
+        "🤖 <b>Assistant Load</b>\n"
+        "━━━━━━━━━━━━━━━━━━━━━━\n"
+    )
+    for row in rows:
+        text += (
+            f"<b>Assistant {row['assistant']}</b> • score <code>{row['score']}</code>\n"
+            f"╰ 🔊 <code>{row['calls']}</code> calls • 🎥 <code>{row['video']}</code> video • "
+            f"💬 <code>{row['joined']}</code> chats • ➕ <code>{row['placed']}</code> placed\n"
+        )
+    text += (
+        f"\n⚖️ Weights: call <code>{placement.call_weight}</code>, "
+        f"video <code>{placement.video_weight}</code>, chat <code>{placement.joined_weight}</code>"
+    )
+    await message.reply_text(text)
@@ -19,6 +19,7 @@ from DeadlineTech.utils.database import (
 )
 from DeadlineTech.utils.decorators.language import language
 from DeadlineTech.utils.pastebin import AnonyBin
+from DeadlineTech.utils.stream.snapshot import queue_snapshots
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -75,6 +76,7 @@ async def update_(client, message, _):
     else:
         nrs = await response.edit(_final_updates_, disable_web_page_preview=True)
     os.system("git stash &> /dev/null && git pull")
+    await queue_snapshots.close()
 
     try:
         served_chats = await get_active_chats()
@@ -113,20 +115,22 @@ async def update_(client, message, _):
 @app.on_message(filters.command(["restart"]) & SUDOERS)
 async def restart_(_, message):
     response = await message.reply_text("ʀᴇsᴛᴀʀᴛɪɴɢ...")
+    # Queues are resumed on boot, save them before the active chats are cleared
+    await queue_snapshots.close()
     ac_chats = await get_active_chats()
     for x in ac_chats:
         try:
             await app.send_message(
                 chat_id=int(x),
-                text=f"{app.mention} ɪs ʀᴇsᴛᴀʀᴛɪɴɢ...\n\nʏᴏᴜ ᴄᴀɴ sᴛᴀʀᴛ ᴩʟᴀʏɪɴɢ ᴀɢᴀɪɴ ᴀғᴛᴇʀ 15-20 sᴇᴄᴏɴᴅs.",
+                text=f"{app.mention} ɪs ʀᴇsᴛᴀʀᴛɪɴɢ...\n\nᴛʜᴇ ǫᴜᴇᴜᴇ ᴡɪʟʟ ʀᴇsᴜᴍᴇ ɪɴ 15-20 sᴇᴄᴏɴᴅs.",
             )
             await remove_active_chat(x)
             await remove_active_video_chat(x)
         except:
             pass
 
+    # downloads/ is kept, it's the media cache the resumed queues play from
     try:
-        shutil.rmtree("downloads")
         shutil.rmtree("raw_files")
         shutil.rmtree("cache")
     except:
@@ -6,10 +6,9 @@ from zoneinfo import ZoneInfo
 
 from DeadlineTech import app
 from DeadlineTech.misc import SUDOERS
-from DeadlineTech.utils.database import (
-    get_active_chats,
-    get_active_video_chats,
-)
+from DeadlineTech.core.userbot import assistants
+from DeadlineTech.utils.activecalls import active_calls
+from DeadlineTech.utils.formatters import get_readable_time
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -30,27 +29,27 @@ def get_current_time():
 
 def generate_summary_text(voice_count, video_count):
     total = voice_count + video_count
-    return (
+    text = (
         "📊 <b>Call Activity Summary</b>\n"
         "━━━━━━━━━━━━━━━━━━━━━━\n"
         f"🔊 <b>Voice Chats:</b> <code>{voice_count}</code>\n"
         f"🎥 <b>Video Chats:</b> <code>{video_count}</code>\n"
         f"📞 <b>Total:</b> <code>{total}</code>\n"
-        f"🕒 <b>Updated:</b> <code>{get_current_time()}</code>"
     )
+    for number in assistants:
+        calls, videos = active_calls.assistant_load(number)
+        text += f"🤖 <b>Assistant {number}:</b> <code>{calls}</code> calls • <code>{videos}</code> video\n"
+    oldest = active_calls.oldest(1)
+    if oldest:
+        chat_id, running = oldest[0]
+        text += f"⏳ <b>Longest:</b> <code>{chat_id}</code> for <code>{get_readable_time(int(running))}</code>\n"
+    return text + f"🕒 <b>Updated:</b> <code>{get_current_time()}</code>"
 
 
 @app.on_message(filters.command(["activecalls", "acalls"]) & SUDOERS)
-async def active_calls(_, message: Message):
+async def activecalls_command(_, message: Message):
     try:
-        voice_ids = await get_active_chats()
-        video_ids = await get_active_video_chats()
-    except Exception as e:
-        logger.exception("Error fetching active chats or video chats.")
-        return await message.reply_text("❌ Failed to fetch active calls. Check logs for details.")
-
-    try:
-        text = generate_summary_text(len(voice_ids), len(video_ids))
+        text = generate_summary_text(len(active_calls), len(active_calls.video))
         button = InlineKeyboardMarkup(
             [[InlineKeyboardButton("✖ Close", callback_data=CALLS_CLOSE)]]
         )
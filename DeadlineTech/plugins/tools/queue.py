@@ -11,6 +11,7 @@ from DeadlineTech.utils import AnonyBin, seconds_to_min
 from DeadlineTech.utils.database import is_active_chat, is_music_playing
 from DeadlineTech.utils.decorators.language import language, languageCB
 from DeadlineTech.utils.inline import queue_back_markup, queue_markup
+from DeadlineTech.utils.stream.position import track_position
 from config import BANNED_USERS
 
 basic = {}
@@ -56,7 +57,7 @@ async def get_queue(client, message: Message, _):
             DUR,
             "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(track_position(got[0])),
             got[0]["dur"],
         )
     )
@@ -76,7 +77,7 @@ async def get_queue(client, message: Message, _):
                                     DUR,
                                     "g",
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(track_position(db[chat_id][0])),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -176,7 +177,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             DUR,
             "g",
             videoid,
-            seconds_to_min(got[0]["played"]),
+            seconds_to_min(track_position(got[0])),
             got[0]["dur"],
         )
     )
@@ -197,7 +198,7 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
                                     DUR,
                                     "g",
                                     videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
+                                    seconds_to_min(track_position(db[chat_id][0])),
                                     db[chat_id][0]["dur"],
                                 )
                                 await mystic.edit_reply_markup(reply_markup=buttons)
@@ -11,6 +11,7 @@ from DeadlineTech.misc import db
 from DeadlineTech.utils.database import get_assistant, get_authuser_names, get_cmode
 from DeadlineTech.utils.decorators import ActualAdminCB, AdminActual, language
 from DeadlineTech.utils.formatters import alpha_to_int, get_readable_time
+from DeadlineTech.utils.stream.queue import ChatQueue
 from config import BANNED_USERS, adminlist, lyrical
 
 rel = {}
@@ -49,7 +50,7 @@ async def restartbot(client, message: Message, _):
     mystic = await message.reply_text(_["reload_4"].format(app.mention))
     await asyncio.sleep(1)
     try:
-        db[message.chat.id] = []
+        db[message.chat.id] = ChatQueue()
         await Anony.stop_stream_force(message.chat.id)
     except:
         pass
@@ -76,7 +77,7 @@ async def restartbot(client, message: Message, _):
         except:
             pass
         try:
-            db[chat_id] = []
+            db[chat_id] = ChatQueue()
             await Anony.stop_stream_force(chat_id)
         except:
             pass
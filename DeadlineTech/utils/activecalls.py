@@ -0,0 +1,79 @@
+# Powered By Team DeadlineTech
+
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class ActiveCalls:
+    """
+    Registry of the chats with a live call.
+
+    Membership is a dict lookup. On top of it the registry keeps the video
+    chats, the chats of each assistant and the time each call started (the
+    dict keeps start order), so counts and per-assistant lists never need a
+    scan over every call.
+    """
+
+    def __init__(self):
+        self.started: Dict[int, float] = {}
+        self.video: Set[int] = set()
+        self.assistant_of: Dict[int, int] = {}
+        self.by_assistant: Dict[int, Set[int]] = defaultdict(set)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self.started
+
+    def __len__(self) -> int:
+        return len(self.started)
+
+    def add(self, chat_id: int, assistant: Optional[int] = None):
+        if chat_id not in self.started:
+            self.started[chat_id] = time.time()
+        self.move(chat_id, assistant)
+
+    def remove(self, chat_id: int):
+        self.started.pop(chat_id, None)
+        self.move(chat_id, None)
+
+    def move(self, chat_id: int, assistant: Optional[int]):
+        """Re-indexes a chat under the assistant now serving it."""
+        old = self.assistant_of.pop(chat_id, None)
+        if old is not None:
+            self.by_assistant[old].discard(chat_id)
+        if assistant is not None and chat_id in self.started:
+            self.assistant_of[chat_id] = assistant
+            self.by_assistant[assistant].add(chat_id)
+
+    def set_video(self, chat_id: int, video: bool):
+        if video:
+            self.video.add(chat_id)
+        else:
+            self.video.discard(chat_id)
+
+    def chats(self) -> List[int]:
+        return list(self.started)
+
+    def video_chats(self) -> List[int]:
+        return list(self.video)
+
+    def on_assistant(self, number: int) -> Set[int]:
+        return self.by_assistant.get(number, set())
+
+    def assistant_load(self, number: int) -> Tuple[int, int]:
+        """Returns (calls, video calls) served by an assistant."""
+        chats = self.on_assistant(number)
+        return len(chats), len(chats & self.video)
+
+    def oldest(self, limit: int = 5) -> List[Tuple[int, float]]:
+        """The longest running calls as (chat_id, seconds running)."""
+        now = time.time()
+        result = []
+        for chat_id, started in self.started.items():
+            if len(result) >= limit:
+                break
+            result.append((chat_id, now - started))
+        return result
+
+
+active_calls = ActiveCalls()
@@ -0,0 +1,143 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from DeadlineTech.logging import LOGGER
+
+# (chat, task) of the job being run, lets a job call back into its own chat. Tasks
+# the job spawns copy the context but are other tasks, so they still queue.
+_owner: ContextVar[Optional[Tuple[int, asyncio.Task]]] = ContextVar("chat_actor_owner", default=None)
+
+
+class _Job:
+    __slots__ = ("func", "args", "kwargs", "future")
+
+    def __init__(self, func, args, kwargs, future):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+
+
+class ChatActor:
+    """
+    Owns one chat's queue and call state.
+
+    Jobs (play, skip, seek, stream end, ...) posted for the chat run one at a
+    time in arrival order on a single task, so they never interleave. The task
+    exits once its inbox has been empty for `idle_timeout` seconds.
+    """
+
+    def __init__(self, chat_id: int, registry: "ChatActors"):
+        self.chat_id = chat_id
+        self.registry = registry
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.processed = 0
+        self.task = asyncio.create_task(self._loop())
+
+    async def _execute(self, job: _Job):
+        _owner.set((self.chat_id, asyncio.current_task()))
+        return await job.func(*job.args, **job.kwargs)
+
+    def _drop_pending(self):
+        while not self.inbox.empty():
+            job = self.inbox.get_nowait()
+            if job.future is not None:
+                job.future.cancel()
+
+    async def _loop(self):
+        while True:
+            try:
+                job = await asyncio.wait_for(self.inbox.get(), self.registry.idle_timeout)
+            except asyncio.TimeoutError:
+                if self.inbox.empty():
+                    self.registry._retire(self)
+                    return
+                continue
+            if job.future is not None and job.future.cancelled():
+                continue
+            # Each job is its own task: whatever it raises, a cancellation included,
+            # is that job's outcome and the actor moves on to the next one
+            running = asyncio.ensure_future(self._execute(job))
+            try:
+                await asyncio.wait({running})
+            except asyncio.CancelledError:
+                running.cancel()
+                self._drop_pending()
+                raise
+            finally:
+                self.processed += 1
+            if running.cancelled():
+                if job.future is not None:
+                    job.future.cancel()
+                else:
+                    LOGGER(__name__).warning(
+                        f"{getattr(job.func, '__name__', job.func)} was cancelled in chat {self.chat_id}"
+                    )
+            elif running.exception() is not None:
+                if job.future is None:
+                    LOGGER(__name__).error(
+                        f"{getattr(job.func, '__name__', job.func)} failed in chat {self.chat_id}: {running.exception()}"
+                    )
+                elif not job.future.done():
+                    job.future.set_exception(running.exception())
+            elif job.future is not None and not job.future.done():
+                job.future.set_result(running.result())
+
+
+class ChatActors:
+    """One ChatActor per chat, created on demand. Different chats run in parallel."""
+
+    def __init__(self, idle_timeout: float = 60):
+        self.idle_timeout = idle_timeout
+        self.actors: Dict[int, ChatActor] = {}
+        self.retired = 0
+
+    def _actor(self, chat_id: int) -> ChatActor:
+        actor = self.actors.get(chat_id)
+        if actor is None or actor.task.done():
+            actor = self.actors[chat_id] = ChatActor(chat_id, self)
+        return actor
+
+    def _retire(self, actor: ChatActor):
+        if self.actors.get(actor.chat_id) is actor:
+            del self.actors[actor.chat_id]
+            self.retired += 1
+
+    async def run(self, chat_id: int, func: Callable[..., Awaitable[Any]], *args, **kwargs):
+        """Runs func on the chat's actor and returns its result."""
+        if _owner.get() == (chat_id, asyncio.current_task()):
+            # Already on this chat's actor, queueing would wait on ourselves
+            return await func(*args, **kwargs)
+        future = asyncio.get_running_loop().create_future()
+        self._actor(chat_id).inbox.put_nowait(_Job(func, args, kwargs, future))
+        return await future
+
+    def post(self, chat_id: int, func: Callable[..., Awaitable[Any]], *args, **kwargs):
+        """Queues func on the chat's actor without waiting for it."""
+        self._actor(chat_id).inbox.put_nowait(_Job(func, args, kwargs, None))
+
+    def stats(self) -> dict:
+        return {
+            "actors": len(self.actors),
+            "queued": sum(actor.inbox.qsize() for actor in self.actors.values()),
+            "retired": self.retired,
+        }
+
+
+actors = ChatActors()
+
+
+def serialized(chat_of: Callable[..., int]):
+    """Decorator running a handler on the actor of the chat returned by chat_of(*args)."""
+
+    def decorator(func):
+        async def wrapper(*args, **kwargs):
+            return await actors.run(chat_of(*args, **kwargs), func, *args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        return wrapper
+
+    return decorator
@@ -0,0 +1,77 @@
+# Powered By Team DeadlineTech
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+# Returned by TTLCache.get on a miss, so a cached None (negative entry) stays distinguishable
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with per-entry expiry.
+
+    Entries are evicted least recently used first once `maxsize` is reached.
+    A value of None is a negative entry ("looked up, nothing found") and is
+    kept for `negative_ttl` seconds instead of `ttl`.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: Optional[float] = None):
+        self.maxsize = max(maxsize, 1)
+        self.ttl = ttl
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        item = self._data.get(key)
+        if item is not None:
+            value, expires = item
+            if expires > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                if value is None:
+                    self.negative_hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if ttl is None:
+            ttl = self.negative_ttl if value is None else self.ttl
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return item[0] if item else default
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        item = self._data.get(key)
+        return item is not None and item[1] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -1,10 +1,17 @@
 import random
 import asyncio
-from datetime import date
+from datetime import date, datetime
 from typing import Dict, List, Union
 
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+import config
 from DeadlineTech import userbot
 from DeadlineTech.core.mongo import mongodb
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.activecalls import active_calls
+from DeadlineTech.utils.cache import MISSING, TTLCache
 
 authdb = mongodb.adminauth
 authuserdb = mongodb.authuser
@@ -13,9 +20,11 @@ autoleavedb = mongodb.autoleave
 assdb = mongodb.assistants
 chatsdb = mongodb.chats
 chatdb = mongodb.chat
+chatsettingsdb = mongodb.chat_settings
 channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
 langdb = mongodb.language
+migrationsdb = mongodb.migrations
 onoffdb = mongodb.onoffper
 playmodedb = mongodb.playmode
 playtypedb = mongodb.playtypedb
@@ -23,23 +32,147 @@ skipdb = mongodb.skipmode
 sudoersdb = mongodb.sudoers
 usersdb = mongodb.tgusersdb
 playlistdb = mongodb.playlists
+querydb = mongodb.querycache
+spotifymapdb = mongodb.spotifymap
 
 # Shifting to memory [mongo sucks often]
-active = []
-activevideo = []
 assistantdict = {}
-autoend = {}
-autoleave = {}
-count = {}
-channelconnect = {}
-langm = {}
 loop = {}
 maintenance = []
-nonadmin = {}
 pause = {}
-playmode = {}
-playtype = {}
-skipmode = {}
+# Bot settings keyed by (setting, key) and each chat's settings document keyed by ("chat", chat_id).
+# A cached False/None is a hit.
+settingscache = TTLCache(config.SETTINGS_CACHE_SIZE, config.SETTINGS_CACHE_TTL or float("inf"))
+settingsstats: Dict[str, Dict[str, int]] = {}
+# Hot search queries, in front of querydb
+querycache = TTLCache(config.QUERY_CACHE_SIZE, 3600)
+querystats = {"memory": 0, "mongo": 0, "misses": 0}
+# Spotify track id -> youtube video, in front of spotifymapdb
+spotifycache = TTLCache(config.QUERY_CACHE_SIZE, 3600)
+spotifystats = {"memory": 0, "mongo": 0, "misses": 0, "stale": 0}
+
+
+# Bumped by every bot setting write, a load that raced one isn't cached
+settingversions = {}
+
+
+async def _get_setting(name: str, chat_id: int, load):
+    stats = settingsstats.setdefault(name, {"hits": 0, "misses": 0})
+    value = settingscache.get((name, chat_id))
+    if value is not MISSING:
+        stats["hits"] += 1
+        return value
+    stats["misses"] += 1
+    version = settingversions.get((name, chat_id), 0)
+    value = await load()
+    # A write that landed while loading wins over what was loaded
+    if settingversions.get((name, chat_id), 0) == version:
+        settingscache.set((name, chat_id), value)
+    return value
+
+
+def _put_setting(name: str, chat_id: int, value):
+    # Write-through, called once the Mongo write has succeeded so the cache
+    # never holds a value that wasn't saved
+    settingversions[(name, chat_id)] = settingversions.get((name, chat_id), 0) + 1
+    settingscache.set((name, chat_id), value)
+
+
+def settings_cache_stats() -> dict:
+    return {"cache": settingscache.stats(), "settings": dict(settingsstats)}
+
+
+# Fields of a chat_settings document and their value when unset
+CHAT_SETTINGS = {
+    "lang": "en",
+    "playmode": "Direct",
+    "playtype": "Everyone",
+    "cmode": None,
+    "skipmode": True,
+    "upvotes": 5,
+    "nonadmin": False,
+    "assistant": None,
+}
+
+
+def _chat_entry(document: dict) -> dict:
+    return {key: document.get(key, default) for key, default in CHAT_SETTINGS.items()}
+
+
+# Bumped by every chat setting write, a read that raced one isn't cached
+chatversions = {}
+
+
+async def _get_chat_setting(name: str, chat_id: int):
+    # Every setting of a chat comes from its one chat_settings document
+    stats = settingsstats.setdefault(name, {"hits": 0, "misses": 0})
+    settings = settingscache.get(("chat", chat_id))
+    if settings is MISSING:
+        stats["misses"] += 1
+        version = chatversions.get(chat_id, 0)
+        document = await chatsettingsdb.find_one({"_id": chat_id})
+        settings = _chat_entry(document or {})
+        if chatversions.get(chat_id, 0) == version:
+            settingscache.set(("chat", chat_id), settings)
+    else:
+        stats["hits"] += 1
+    return settings[name]
+
+
+async def _set_chat_setting(name: str, chat_id: int, value):
+    # Mongo first, so the cache never holds a value that wasn't saved
+    await chatsettingsdb.update_one({"_id": chat_id}, {"$set": {name: value}}, upsert=True)
+    chatversions[chat_id] = chatversions.get(chat_id, 0) + 1
+    settings = settingscache.get(("chat", chat_id))
+    if settings is not MISSING:
+        settings[name] = value
+
+
+async def migrate_chat_settings() -> int:
+    """Copies the old one-collection-per-setting data into chat_settings, once."""
+    if await migrationsdb.find_one({"_id": "chat_settings"}):
+        return 0
+    sources = (
+        (langdb, "lang", lambda document: document.get("lang")),
+        (playmodedb, "playmode", lambda document: document.get("mode")),
+        (playtypedb, "playtype", lambda document: document.get("mode")),
+        (channeldb, "cmode", lambda document: document.get("mode")),
+        (countdb, "upvotes", lambda document: document.get("mode")),
+        (assdb, "assistant", lambda document: document.get("assistant")),
+        # A document in skipmode means skip mode is off, one in adminauth means non-admin mode is on
+        (skipdb, "skipmode", lambda document: False),
+        (authdb, "nonadmin", lambda document: True),
+    )
+    migrated = 0
+    for collection, name, value_of in sources:
+        ops = []
+        async for document in collection.find({}):
+            chat_id = document.get("chat_id")
+            value = value_of(document)
+            if chat_id is None or value is None:
+                continue
+            ops.append(UpdateOne({"_id": chat_id}, {"$set": {name: value}}, upsert=True))
+            if len(ops) >= 1000:
+                await chatsettingsdb.bulk_write(ops, ordered=False)
+                migrated += len(ops)
+                ops = []
+        if ops:
+            await chatsettingsdb.bulk_write(ops, ordered=False)
+            migrated += len(ops)
+    await migrationsdb.insert_one({"_id": "chat_settings", "at": datetime.now(), "writes": migrated})
+    LOGGER(__name__).info(f"Migrated {migrated} chat settings into chat_settings")
+    return migrated
+
+
+async def load_chat_settings() -> int:
+    """Migrates if needed, then reads every chat's settings into the cache with one cursor."""
+    await migrate_chat_settings()
+    loaded = 0
+    async for document in chatsettingsdb.find({}):
+        settingscache.set(("chat", document["_id"]), _chat_entry(document))
+        loaded += 1
+    LOGGER(__name__).info(f"Loaded the settings of {loaded} chats")
+    return loaded
 
 
 async def get_assistant_number(chat_id: int) -> str:
@@ -48,37 +181,22 @@ async def get_assistant_number(chat_id: int) -> str:
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.get(assistant)
 
 
 async def set_assistant_new(chat_id, number):
     number = int(number)
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": number}},
-        upsert=True,
-    )
+    await _set_chat_setting("assistant", chat_id, number)
 
 
 async def set_assistant(chat_id):
-    from DeadlineTech.core.userbot import assistants
+    from DeadlineTech.utils.placement import placement
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = await placement.choose()
+    placement.assigned(assistantdict.get(chat_id), ran_assistant)
     assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    active_calls.move(chat_id, ran_assistant)
+    await _set_chat_setting("assistant", chat_id, ran_assistant)
     userbot = await get_client(ran_assistant)
     return userbot
 
@@ -88,12 +206,11 @@ async def get_assistant(chat_id: int) -> str:
 
     assistant = assistantdict.get(chat_id)
     if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
+        got_assis = await _get_chat_setting("assistant", chat_id)
+        if got_assis is None:
             userbot = await set_assistant(chat_id)
             return userbot
         else:
-            got_assis = dbassistant["assistant"]
             if got_assis in assistants:
                 assistantdict[chat_id] = got_assis
                 userbot = await get_client(got_assis)
@@ -111,15 +228,13 @@ async def get_assistant(chat_id: int) -> str:
 
 
 async def set_calls_assistant(chat_id):
-    from DeadlineTech.core.userbot import assistants
+    from DeadlineTech.utils.placement import placement
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = await placement.choose()
+    placement.assigned(assistantdict.get(chat_id), ran_assistant)
     assistantdict[chat_id] = ran_assistant
-    await assdb.update_one(
-        {"chat_id": chat_id},
-        {"$set": {"assistant": ran_assistant}},
-        upsert=True,
-    )
+    active_calls.move(chat_id, ran_assistant)
+    await _set_chat_setting("assistant", chat_id, ran_assistant)
     return ran_assistant
 
 
@@ -128,11 +243,10 @@ async def group_assistant(self, chat_id: int) -> int:
 
     assistant = assistantdict.get(chat_id)
     if not assistant:
-        dbassistant = await assdb.find_one({"chat_id": chat_id})
-        if not dbassistant:
+        assis = await _get_chat_setting("assistant", chat_id)
+        if assis is None:
             assis = await set_calls_assistant(chat_id)
         else:
-            assis = dbassistant["assistant"]
             if assis in assistants:
                 assistantdict[chat_id] = assis
                 assis = assis
@@ -143,95 +257,72 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.calls.get(int(assis))
 
 
 async def is_skipmode(chat_id: int) -> bool:
-    mode = skipmode.get(chat_id)
-    if not mode:
-        user = await skipdb.find_one({"chat_id": chat_id})
-        if not user:
-            skipmode[chat_id] = True
-            return True
-        skipmode[chat_id] = False
-        return False
-    return mode
+    return await _get_chat_setting("skipmode", chat_id)
 
 
 async def skip_on(chat_id: int):
-    skipmode[chat_id] = True
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if user:
-        return await skipdb.delete_one({"chat_id": chat_id})
+    if await is_skipmode(chat_id):
+        return
+    await _set_chat_setting("skipmode", chat_id, True)
 
 
 async def skip_off(chat_id: int):
-    skipmode[chat_id] = False
-    user = await skipdb.find_one({"chat_id": chat_id})
-    if not user:
-        return await skipdb.insert_one({"chat_id": chat_id})
+    if not await is_skipmode(chat_id):
+        return
+    await _set_chat_setting("skipmode", chat_id, False)
 
 
 async def get_upvote_count(chat_id: int) -> int:
-    mode = count.get(chat_id)
-    if not mode:
-        mode = await countdb.find_one({"chat_id": chat_id})
-        if not mode:
-            return 5
-        count[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await _get_chat_setting("upvotes", chat_id)
 
 
 async def set_upvotes(chat_id: int, mode: int):
-    count[chat_id] = mode
-    await countdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await _set_chat_setting("upvotes", chat_id, mode)
 
 
 async def is_autoend() -> bool:
     chat_id = 1234
-    user = await autoenddb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+
+    async def load():
+        return bool(await autoenddb.find_one({"chat_id": chat_id}))
+
+    return await _get_setting("autoend", chat_id, load)
 
 
 async def autoend_on():
     chat_id = 1234
     await autoenddb.insert_one({"chat_id": chat_id})
+    _put_setting("autoend", chat_id, True)
 
 
 async def autoend_off():
     chat_id = 1234
     await autoenddb.delete_one({"chat_id": chat_id})
+    _put_setting("autoend", chat_id, False)
 
 async def is_autoleave() -> bool:
     chat_id = 1234
-    user = await autoleavedb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+
+    async def load():
+        return bool(await autoleavedb.find_one({"chat_id": chat_id}))
+
+    return await _get_setting("autoleave", chat_id, load)
 
 
 async def autoleave_on():
     chat_id = 1234
     await autoleavedb.insert_one({"chat_id": chat_id})
+    _put_setting("autoleave", chat_id, True)
 
 
 async def autoleave_off():
     chat_id = 1234
     await autoleavedb.delete_one({"chat_id": chat_id})
+    _put_setting("autoleave", chat_id, False)
 
 
 async def get_loop(chat_id: int) -> int:
@@ -246,76 +337,35 @@ async def set_loop(chat_id: int, mode: int):
 
 
 async def get_cmode(chat_id: int) -> int:
-    mode = channelconnect.get(chat_id)
-    if not mode:
-        mode = await channeldb.find_one({"chat_id": chat_id})
-        if not mode:
-            return None
-        channelconnect[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await _get_chat_setting("cmode", chat_id)
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    await channeldb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await _set_chat_setting("cmode", chat_id, mode)
 
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if not mode:
-        mode = await playtypedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playtype[chat_id] = "Everyone"
-            return "Everyone"
-        playtype[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await _get_chat_setting("playtype", chat_id)
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    await playtypedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await _set_chat_setting("playtype", chat_id, mode)
 
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if not mode:
-        mode = await playmodedb.find_one({"chat_id": chat_id})
-        if not mode:
-            playmode[chat_id] = "Direct"
-            return "Direct"
-        playmode[chat_id] = mode["mode"]
-        return mode["mode"]
-    return mode
+    return await _get_chat_setting("playmode", chat_id)
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    await playmodedb.update_one(
-        {"chat_id": chat_id}, {"$set": {"mode": mode}}, upsert=True
-    )
+    await _set_chat_setting("playmode", chat_id, mode)
 
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if not mode:
-        lang = await langdb.find_one({"chat_id": chat_id})
-        if not lang:
-            langm[chat_id] = "en"
-            return "en"
-        langm[chat_id] = lang["lang"]
-        return lang["lang"]
-    return mode
+    return await _get_chat_setting("lang", chat_id)
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    await langdb.update_one({"chat_id": chat_id}, {"$set": {"lang": lang}}, upsert=True)
+    await _set_chat_setting("lang", chat_id, lang)
 
 
 async def is_music_playing(chat_id: int) -> bool:
@@ -334,101 +384,82 @@ async def music_off(chat_id: int):
 
 
 async def get_active_chats() -> list:
-    return active
+    return active_calls.chats()
 
 
 async def is_active_chat(chat_id: int) -> bool:
-    if chat_id not in active:
-        return False
-    else:
-        return True
+    return chat_id in active_calls
 
 
 async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
+    active_calls.add(chat_id, assistantdict.get(chat_id))
 
 
 async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
+    active_calls.remove(chat_id)
 
 
 async def get_active_video_chats() -> list:
-    return activevideo
+    return active_calls.video_chats()
 
 
 async def is_active_video_chat(chat_id: int) -> bool:
-    if chat_id not in activevideo:
-        return False
-    else:
-        return True
+    return chat_id in active_calls.video
 
 
 async def add_active_video_chat(chat_id: int):
-    if chat_id not in activevideo:
-        activevideo.append(chat_id)
+    active_calls.set_video(chat_id, True)
 
 
 async def remove_active_video_chat(chat_id: int):
-    if chat_id in activevideo:
-        activevideo.remove(chat_id)
+    active_calls.set_video(chat_id, False)
 
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    user = await authdb.find_one({"chat_id": chat_id})
-    if not user:
-        return False
-    return True
+    return await _get_chat_setting("nonadmin", chat_id)
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if not mode:
-        user = await authdb.find_one({"chat_id": chat_id})
-        if not user:
-            nonadmin[chat_id] = False
-            return False
-        nonadmin[chat_id] = True
-        return True
-    return mode
+    return await check_nonadmin_chat(chat_id)
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
     is_admin = await check_nonadmin_chat(chat_id)
     if is_admin:
         return
-    return await authdb.insert_one({"chat_id": chat_id})
+    await _set_chat_setting("nonadmin", chat_id, True)
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
     is_admin = await check_nonadmin_chat(chat_id)
     if not is_admin:
         return
-    return await authdb.delete_one({"chat_id": chat_id})
+    await _set_chat_setting("nonadmin", chat_id, False)
 
 
 async def is_on_off(on_off: int) -> bool:
-    onoff = await onoffdb.find_one({"on_off": on_off})
-    if not onoff:
-        return False
-    return True
+    async def load():
+        return bool(await onoffdb.find_one({"on_off": on_off}))
+
+    return await _get_setting("on_off", on_off, load)
 
 
 async def add_on(on_off: int):
     is_on = await is_on_off(on_off)
     if is_on:
         return
-    return await onoffdb.insert_one({"on_off": on_off})
+    result = await onoffdb.insert_one({"on_off": on_off})
+    _put_setting("on_off", on_off, True)
+    return result
 
 
 async def add_off(on_off: int):
     is_off = await is_on_off(on_off)
     if not is_off:
         return
-    return await onoffdb.delete_one({"on_off": on_off})
+    result = await onoffdb.delete_one({"on_off": on_off})
+    _put_setting("on_off", on_off, False)
+    return result
 
 
 async def is_maintenance():
@@ -455,7 +486,9 @@ async def maintenance_off():
     is_off = await is_on_off(1)
     if not is_off:
         return
-    return await onoffdb.delete_one({"on_off": 1})
+    result = await onoffdb.delete_one({"on_off": 1})
+    _put_setting("on_off", 1, False)
+    return result
 
 
 async def maintenance_on():
@@ -464,7 +497,9 @@ async def maintenance_on():
     is_on = await is_on_off(1)
     if is_on:
         return
-    return await onoffdb.insert_one({"on_off": 1})
+    result = await onoffdb.insert_one({"on_off": 1})
+    _put_setting("on_off", 1, True)
+    return result
 
 
 async def is_served_user(user_id: int) -> bool:
@@ -663,3 +698,165 @@ async def remove_track_by_index(user_id: int, name: str, index: int):
         await playlistdb.update_one({"user_id": user_id}, {"$set": {"playlists": playlists}}, upsert=True)
         return True
     return False
+
+
+_query_index = []
+
+
+async def _ensure_query_index():
+    if _query_index:
+        return
+    try:
+        await querydb.create_index("updated_at", expireAfterSeconds=config.QUERY_CACHE_TTL)
+    except OperationFailure as e:
+        # 85/86: an index with another TTL already exists, keep using it
+        if e.code not in (85, 86):
+            LOGGER(__name__).warning(f"Failed to create the query TTL index, retrying later: {e}")
+            return
+    except Exception as e:
+        LOGGER(__name__).warning(f"Failed to create the query TTL index, retrying later: {e}")
+        return
+    _query_index.append(True)
+
+
+async def get_query_video(query: str) -> Union[dict, None]:
+    cached = querycache.get(query)
+    if cached is not MISSING:
+        querystats["memory"] += 1
+        return cached
+    try:
+        found = await querydb.find_one({"_id": query})
+    except Exception:
+        found = None
+    if not found:
+        querystats["misses"] += 1
+        return None
+    querystats["mongo"] += 1
+    track = {
+        "vidid": found["vidid"],
+        "title": found["title"],
+        "duration": found.get("duration"),
+    }
+    querycache.set(query, track)
+    return track
+
+
+async def save_query_video(query: str, vidid: str, title: str, duration: str):
+    querycache.set(query, {"vidid": vidid, "title": title, "duration": duration})
+    await _ensure_query_index()
+    try:
+        await querydb.update_one(
+            {"_id": query},
+            {
+                "$set": {
+                    "vidid": vidid,
+                    "title": title,
+                    "duration": duration,
+                    "updated_at": datetime.utcnow(),
+                }
+            },
+            upsert=True,
+        )
+    except Exception:
+        pass
+
+
+def query_cache_stats() -> dict:
+    lookups = sum(querystats.values())
+    return {
+        **querystats,
+        "hit_rate": round((querystats["memory"] + querystats["mongo"]) / lookups, 3)
+        if lookups
+        else 0.0,
+        "memory_size": len(querycache),
+    }
+
+
+_spotify_index = []
+
+
+async def get_spotify_videos(tracks: List[tuple]) -> Dict[str, dict]:
+    """
+    Batch lookup of (spotify track id, isrc) pairs, returns the known ones by track id.
+    Entries older than SPOTIFY_MAP_TTL are returned with "stale" set.
+    """
+    found = {}
+    missing = []
+    for track_id, isrc in tracks:
+        cached = spotifycache.get(track_id)
+        if cached is not MISSING and cached:
+            found[track_id] = cached
+        else:
+            missing.append((track_id, isrc))
+    spotifystats["memory"] += len(found)
+    if missing:
+        ids = [track_id for track_id, _ in missing]
+        isrcs = [isrc for _, isrc in missing if isrc]
+        query = {"_id": {"$in": ids}}
+        if isrcs:
+            query = {"$or": [query, {"isrc": {"$in": isrcs}}]}
+        by_id, by_isrc = {}, {}
+        try:
+            async for doc in spotifymapdb.find(query):
+                by_id[doc["_id"]] = doc
+                if doc.get("isrc"):
+                    by_isrc[doc["isrc"]] = doc
+        except Exception:
+            pass
+        for track_id, isrc in missing:
+            doc = by_id.get(track_id) or (by_isrc.get(isrc) if isrc else None)
+            if not doc:
+                spotifystats["misses"] += 1
+                continue
+            spotifystats["mongo"] += 1
+            entry = {
+                "vidid": doc["vidid"],
+                "title": doc["title"],
+                "duration": doc.get("duration"),
+                "updated_at": doc["updated_at"],
+            }
+            spotifycache.set(track_id, entry)
+            found[track_id] = entry
+    now = datetime.utcnow()
+    for entry in found.values():
+        entry["stale"] = (now - entry["updated_at"]).total_seconds() > config.SPOTIFY_MAP_TTL
+    spotifystats["stale"] += sum(1 for entry in found.values() if entry["stale"])
+    return found
+
+
+async def save_spotify_video(track_id: str, isrc: str, vidid: str, title: str, duration: str):
+    now = datetime.utcnow()
+    spotifycache.set(track_id, {"vidid": vidid, "title": title, "duration": duration, "updated_at": now})
+    if not _spotify_index:
+        _spotify_index.append(True)
+        try:
+            await spotifymapdb.create_index("isrc")
+        except Exception:
+            pass
+    try:
+        await spotifymapdb.update_one(
+            {"_id": track_id},
+            {
+                "$set": {
+                    "isrc": isrc,
+                    "vidid": vidid,
+                    "title": title,
+                    "duration": duration,
+                    "updated_at": now,
+                }
+            },
+            upsert=True,
+        )
+    except Exception:
+        pass
+
+
+def spotify_map_stats() -> dict:
+    lookups = spotifystats["memory"] + spotifystats["mongo"] + spotifystats["misses"]
+    return {
+        **spotifystats,
+        "hit_rate": round((spotifystats["memory"] + spotifystats["mongo"]) / lookups, 3)
+        if lookups
+        else 0.0,
+        "memory_size": len(spotifycache),
+    }
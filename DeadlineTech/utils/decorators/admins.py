@@ -5,6 +5,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from DeadlineTech import app
 from DeadlineTech.misc import SUDOERS, db
+from DeadlineTech.utils.actor import actors
 from DeadlineTech.utils.database import (
     get_authuser_names,
     get_cmode,
@@ -123,7 +124,7 @@ def AdminRightsCheck(mystic):
                             await log_admin_action(chat_id, message.from_user.id, "Blocked: not admin + no skipmode", message.command[0])
                             return await message.reply_text(_["admin_14"])
 
-            return await mystic(client, message, _, chat_id)
+            return await actors.run(chat_id, mystic, client, message, _, chat_id)
 
         except Exception as e:
             logger.exception(f"Unhandled exception in AdminRightsCheck: {e}")
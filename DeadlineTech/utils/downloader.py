@@ -0,0 +1,253 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable, Deque, List, Optional
+
+import aiofiles
+import aiohttp
+
+from DeadlineTech.logging import LOGGER
+
+
+class DownloadStats:
+    __slots__ = ("url", "size", "downloaded", "resumes", "segments", "started", "finished", "ok")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.size = None
+        self.downloaded = 0
+        self.resumes = 0
+        self.segments = 1
+        self.started = time.monotonic()
+        self.finished = None
+        self.ok = False
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def throughput(self) -> float:
+        """Average bytes per second over the whole download."""
+        return self.downloaded / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "size": self.size,
+            "downloaded": self.downloaded,
+            "resumes": self.resumes,
+            "segments": self.segments,
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput),
+            "ok": self.ok,
+        }
+
+
+class _Incomplete(Exception):
+    pass
+
+
+def _range_start(resp: aiohttp.ClientResponse) -> Optional[int]:
+    # "Content-Range: bytes 100-199/200"
+    try:
+        return int(resp.headers["Content-Range"].split()[1].split("-")[0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+class RangedDownloader:
+    """
+    HTTP downloader that writes to a `.part` file and renames it into place
+    once complete. Interrupted transfers are resumed with a `Range` request
+    instead of starting over, and large files can be fetched as several
+    parallel ranged segments when the server advertises `Accept-Ranges`.
+
+    The aiohttp session comes from `session_factory`, so it can be pointed at
+    any server (including a local stand-in).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Awaitable[aiohttp.ClientSession]],
+        retries: int = 5,
+        retry_delay: float = 2,
+        chunk_size: int = 1024 * 1024,
+        connections: int = 1,
+        parallel_min_size: int = 16 * 1024 * 1024,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        history: int = 50,
+    ):
+        self.session_factory = session_factory
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.chunk_size = chunk_size
+        self.connections = max(connections, 1)
+        self.parallel_min_size = parallel_min_size
+        self.timeout = timeout or aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
+        self.recent: Deque[DownloadStats] = deque(maxlen=history)
+
+    @staticmethod
+    def part_path(out_path: str) -> str:
+        return f"{out_path}.part"
+
+    async def fetch(
+        self,
+        url: str,
+        out_path: str,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> bool:
+        """
+        Downloads `url` to `out_path`. `on_progress` is called with the number
+        of contiguous bytes on disk, which forces a sequential download so the
+        `.part` file can be read while it grows.
+        """
+        Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+        part = self.part_path(out_path)
+        stats = DownloadStats(url)
+        self.recent.append(stats)
+        try:
+            size, ranges = (None, False)
+            if on_progress is None and self.connections > 1:
+                size, ranges = await self._probe(url)
+            stats.size = size
+            if ranges and size and size >= self.parallel_min_size:
+                await self._fetch_parallel(url, part, size, stats)
+            else:
+                await self._fetch_sequential(url, part, stats, on_progress)
+            os.replace(part, out_path)
+            stats.ok = True
+            return True
+        except asyncio.CancelledError:
+            self._discard(part)
+            raise
+        except Exception as e:
+            LOGGER(__name__).error(f"Download of {url} failed: {e}")
+            self._discard(part)
+            return False
+        finally:
+            stats.finished = time.monotonic()
+            LOGGER(__name__).info(
+                f"Download {'finished' if stats.ok else 'failed'}: {stats.downloaded} bytes in "
+                f"{stats.elapsed:.2f}s ({stats.throughput / 1024:.0f} KiB/s, "
+                f"{stats.segments} segment(s), {stats.resumes} resume(s))"
+            )
+
+    @staticmethod
+    def _discard(part: str):
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+
+    async def _probe(self, url: str):
+        try:
+            session = await self.session_factory()
+            async with session.head(url, allow_redirects=True, timeout=self.timeout) as resp:
+                if resp.status != 200:
+                    return None, False
+                ranges = resp.headers.get("Accept-Ranges", "").lower() == "bytes"
+                return resp.content_length, ranges
+        except Exception:
+            return None, False
+
+    async def _fetch_sequential(self, url, part, stats, on_progress):
+        offset = 0
+        for attempt in range(1, self.retries + 1):
+            headers = {}
+            if offset:
+                # Plenty of CDNs honour ranges without advertising Accept-Ranges,
+                # a server that doesn't answers 200 and the file starts over
+                headers["Range"] = f"bytes={offset}-"
+                stats.resumes += 1
+            try:
+                session = await self.session_factory()
+                async with session.get(url, headers=headers, timeout=self.timeout) as resp:
+                    if resp.status == 416 and stats.size is not None and offset >= stats.size:
+                        return
+                    if resp.status not in (200, 206):
+                        raise _Incomplete(f"HTTP {resp.status}")
+                    if resp.status == 206 and _range_start(resp) != offset:
+                        got = resp.headers.get("Content-Range")
+                        offset = 0
+                        raise _Incomplete(f"unexpected Content-Range {got}, starting over")
+                    if resp.status == 200:
+                        # Server ignored the range (or this is the first request), start over
+                        offset = 0
+                        stats.size = resp.content_length
+                    mode = "ab" if resp.status == 206 else "wb"
+                    async with aiofiles.open(part, mode) as f:
+                        async for chunk in resp.content.iter_chunked(self.chunk_size):
+                            await f.write(chunk)
+                            offset += len(chunk)
+                            stats.downloaded += len(chunk)
+                            if on_progress:
+                                await f.flush()
+                                on_progress(offset)
+                if stats.size is not None and offset < stats.size:
+                    raise _Incomplete(f"connection closed at {offset}/{stats.size} bytes")
+                if offset == 0:
+                    raise _Incomplete("empty response")
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, _Incomplete) as e:
+                if attempt >= self.retries:
+                    raise
+                LOGGER(__name__).warning(
+                    f"Download interrupted ({e}), {'resuming at ' + str(offset) if offset else 'retrying'}"
+                )
+                await asyncio.sleep(self.retry_delay)
+
+    async def _fetch_parallel(self, url, part, size, stats):
+        step = -(-size // self.connections)
+        bounds: List[List[int]] = [
+            [start, min(start + step, size) - 1] for start in range(0, size, step)
+        ]
+        stats.segments = len(bounds)
+        async with aiofiles.open(part, "wb") as f:
+            await f.truncate(size)
+        segments = [asyncio.ensure_future(self._fetch_segment(url, part, b, stats)) for b in bounds]
+        try:
+            done, _ = await asyncio.wait(segments, return_when=asyncio.FIRST_EXCEPTION)
+            for segment in done:
+                segment.result()
+        finally:
+            # A failed segment stops the others before the .part file is discarded
+            for segment in segments:
+                segment.cancel()
+            await asyncio.gather(*segments, return_exceptions=True)
+        if os.path.getsize(part) != size:
+            raise _Incomplete("segment sizes don't add up")
+
+    async def _fetch_segment(self, url, part, bounds, stats):
+        # bounds[0] advances as bytes land, so a retry resumes the segment where it stopped
+        end = bounds[1]
+        for attempt in range(1, self.retries + 1):
+            if attempt > 1:
+                stats.resumes += 1
+            try:
+                session = await self.session_factory()
+                headers = {"Range": f"bytes={bounds[0]}-{end}"}
+                async with session.get(url, headers=headers, timeout=self.timeout) as resp:
+                    if resp.status != 206:
+                        raise _Incomplete(f"HTTP {resp.status} for ranged request")
+                    async with aiofiles.open(part, "r+b") as f:
+                        await f.seek(bounds[0])
+                        async for chunk in resp.content.iter_chunked(self.chunk_size):
+                            chunk = chunk[: end + 1 - bounds[0]]
+                            await f.write(chunk)
+                            bounds[0] += len(chunk)
+                            stats.downloaded += len(chunk)
+                            if bounds[0] > end:
+                                break
+                if bounds[0] <= end:
+                    raise _Incomplete(f"segment closed at {bounds[0]}/{end + 1} bytes")
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, _Incomplete) as e:
+                if attempt >= self.retries:
+                    raise
+                LOGGER(__name__).warning(f"Segment interrupted ({e}), resuming at {bounds[0]}")
+                await asyncio.sleep(self.retry_delay)
@@ -0,0 +1,94 @@
+# Powered By Team DeadlineTech
+
+import time
+from typing import Dict, Set
+
+import config
+from DeadlineTech.logging import LOGGER
+
+
+class _State:
+    __slots__ = ("failures", "total_failures", "floods", "cooldown_until", "last_error")
+
+    def __init__(self):
+        self.failures = 0
+        self.total_failures = 0
+        self.floods = 0
+        self.cooldown_until = 0.0
+        self.last_error = None
+
+
+class AssistantHealth:
+    """
+    Tracks call failures and FloodWaits per assistant.
+
+    An assistant that fails `threshold` times in a row (or gets a FloodWait) is
+    taken out of rotation until its cooldown ends, placement skips it and the
+    chats it fails on are moved to another assistant.
+    """
+
+    def __init__(self, threshold: int, cooldown: int):
+        self.threshold = max(threshold, 1)
+        self.cooldown = cooldown
+        self.states: Dict[int, _State] = {}
+        self.failovers = 0
+
+    def _state(self, number: int) -> _State:
+        state = self.states.get(number)
+        if state is None:
+            state = self.states[number] = _State()
+        return state
+
+    def record_success(self, number: int):
+        state = self.states.get(number)
+        if state:
+            state.failures = 0
+
+    def record_failure(self, number: int, error: Exception):
+        state = self._state(number)
+        state.failures += 1
+        state.total_failures += 1
+        state.last_error = f"{type(error).__name__}: {error}"
+        if state.failures >= self.threshold:
+            state.cooldown_until = time.monotonic() + self.cooldown
+            LOGGER(__name__).warning(
+                f"Assistant {number} failed {state.failures} times in a row, "
+                f"out of rotation for {self.cooldown}s ({state.last_error})"
+            )
+
+    def record_flood(self, number: int, seconds: int):
+        state = self._state(number)
+        state.floods += 1
+        state.last_error = f"FloodWait {seconds}s"
+        state.cooldown_until = max(state.cooldown_until, time.monotonic() + seconds)
+        LOGGER(__name__).warning(f"Assistant {number} hit a FloodWait of {seconds}s")
+
+    def healthy(self, number: int) -> bool:
+        state = self.states.get(number)
+        if state is None or not state.cooldown_until:
+            return True
+        if time.monotonic() < state.cooldown_until:
+            return False
+        # Cooldown is over, give it another chance
+        state.cooldown_until = 0.0
+        state.failures = 0
+        return True
+
+    def unhealthy(self) -> Set[int]:
+        return {number for number in list(self.states) if not self.healthy(number)}
+
+    def stats(self) -> Dict[int, dict]:
+        now = time.monotonic()
+        return {
+            number: {
+                "healthy": self.healthy(number),
+                "failures": state.total_failures,
+                "floods": state.floods,
+                "cooldown": max(round(state.cooldown_until - now), 0),
+                "last_error": state.last_error,
+            }
+            for number, state in self.states.items()
+        }
+
+
+health = AssistantHealth(config.ASSISTANT_FAILURE_THRESHOLD, config.ASSISTANT_COOLDOWN)
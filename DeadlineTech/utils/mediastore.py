@@ -0,0 +1,230 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import config
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import db
+
+MEDIA_DIRS = {False: Path("downloads/audio"), True: Path("downloads/video")}
+MEDIA_EXTS = {False: "m4a", True: "mp4"}
+FORMAT_UNSAFE = re.compile(r"[^\w-]")
+# Left behind by an interrupted RangedDownloader or yt-dlp run
+PARTIAL_MARKERS = (".part", ".ytdl")
+
+
+def is_partial(name: str) -> bool:
+    return name.endswith(PARTIAL_MARKERS) or ".part-Frag" in name
+
+
+class MediaEntry:
+    __slots__ = ("path", "size", "last_access", "hits")
+
+    def __init__(self, path: str, size: int, last_access: float, hits: int = 0):
+        self.path = path
+        self.size = size
+        self.last_access = last_access
+        self.hits = hits
+
+
+class GrowingFile:
+    """A store file that is still being downloaded and may already be played."""
+
+    __slots__ = ("read_path", "ready", "task")
+
+    def __init__(self, read_path: str):
+        self.read_path = read_path
+        self.ready = asyncio.Event()
+        self.task: Optional[asyncio.Future] = None
+
+
+class MediaStore:
+    """
+    Index of downloaded youtube media kept under a byte budget.
+
+    Files are addressed by (video id, audio/video) so repeated plays of the same
+    track are served from disk. Once the budget is exceeded the least recently
+    (or least frequently) played files are evicted, skipping anything that is
+    still referenced by a chat queue.
+    """
+
+    def __init__(self, limit: int, policy: str = "lru"):
+        self.limit = limit
+        self.policy = policy if policy in ("lru", "lfu") else "lru"
+        self.entries: Dict[str, MediaEntry] = {}
+        self.total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.growing: Dict[str, GrowingFile] = {}
+        self._scanned = False
+
+    @staticmethod
+    def path_for(vidid: str, video: bool, format_id: Optional[str] = None) -> Path:
+        # A specific format gets its own file, "<vidid>_<format>.<ext>"
+        name = f"{vidid}_{FORMAT_UNSAFE.sub('_', format_id)}" if format_id else vidid
+        return MEDIA_DIRS[bool(video)] / f"{name}.{MEDIA_EXTS[bool(video)]}"
+
+    @staticmethod
+    def _key(path) -> str:
+        return os.path.normpath(str(path))
+
+    def _scan(self):
+        # Adopt finished files left over from a previous run so they count against
+        # the budget, and delete the partial ones nothing will ever complete
+        self._scanned = True
+        reading = {growing.read_path for growing in self.growing.values()}
+        for video, folder in MEDIA_DIRS.items():
+            if not folder.is_dir():
+                continue
+            for file in folder.iterdir():
+                if is_partial(file.name):
+                    if self._key(file) not in reading:
+                        try:
+                            file.unlink()
+                        except OSError as e:
+                            LOGGER(__name__).warning(f"Failed to remove stale {file}: {e}")
+                    continue
+                # Only "<vidid>.<ext>" is final, yt-dlp names its format and merge
+                # temp files "<vidid>.f137.mp4", "<vidid>.temp.mp4", ...
+                if file.suffix != f".{MEDIA_EXTS[video]}" or "." in file.stem:
+                    continue
+                try:
+                    st = file.stat()
+                except OSError:
+                    continue
+                if not file.is_file() or st.st_size == 0:
+                    continue
+                key = self._key(file)
+                if key not in self.entries:
+                    self.entries[key] = MediaEntry(key, st.st_size, st.st_mtime)
+                    self.total += st.st_size
+        LOGGER(__name__).info(
+            f"Media store indexed {len(self.entries)} files ({self.total} bytes)"
+        )
+
+    def lookup(self, vidid: str, video: bool, format_id: Optional[str] = None) -> Optional[str]:
+        if not self._scanned:
+            self._scan()
+        key = self._key(self.path_for(vidid, video, format_id))
+        entry = self.entries.get(key)
+        if entry:
+            if os.path.exists(key):
+                entry.hits += 1
+                entry.last_access = time.time()
+                self.hits += 1
+                return key
+            self._drop(key)
+        self.misses += 1
+        return None
+
+    def contains(self, vidid: str, video: bool) -> bool:
+        if not self._scanned:
+            self._scan()
+        key = self._key(self.path_for(vidid, video))
+        return key in self.entries and os.path.exists(key)
+
+    def add(self, path) -> Optional[str]:
+        if not self._scanned:
+            self._scan()
+        key = self._key(path)
+        try:
+            size = os.path.getsize(key)
+        except OSError:
+            return None
+        entry = self.entries.get(key)
+        if entry:
+            self.total -= entry.size
+            entry.size = size
+            entry.last_access = time.time()
+        else:
+            self.entries[key] = MediaEntry(key, size, time.time())
+        self.total += size
+        self.evict()
+        return key
+
+    def owns(self, path) -> bool:
+        if not path:
+            return False
+        key = self._key(path)
+        return key in self.entries or key in self.growing
+
+    def expect(self, path, read_path=None) -> GrowingFile:
+        key = self._key(path)
+        growing = self.growing.get(key)
+        if growing is None:
+            growing = self.growing[key] = GrowingFile(self._key(read_path or path))
+        return growing
+
+    def growing_file(self, path) -> Optional[GrowingFile]:
+        if not path:
+            return None
+        return self.growing.get(self._key(path))
+
+    def settle(self, path):
+        self.growing.pop(self._key(path), None)
+
+    def _drop(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.total -= entry.size
+
+    def _referenced(self) -> Set[str]:
+        refs = set()
+        for queue in db.values():
+            for track in queue or []:
+                file = track.get("file")
+                if file:
+                    refs.add(self._key(file))
+                vidid = track.get("vidid")
+                if vidid:
+                    refs.add(self._key(self.path_for(vidid, False)))
+                    refs.add(self._key(self.path_for(vidid, True)))
+        return refs
+
+    def evict(self):
+        if self.total <= self.limit:
+            return
+        refs = self._referenced()
+        if self.policy == "lfu":
+            order = lambda e: (e.hits, e.last_access)
+        else:
+            order = lambda e: e.last_access
+        for entry in sorted(self.entries.values(), key=order):
+            if self.total <= self.limit:
+                break
+            if entry.path in refs:
+                continue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                LOGGER(__name__).warning(f"Failed to evict {entry.path}: {e}")
+                continue
+            self._drop(entry.path)
+            self.evictions += 1
+        if self.total > self.limit:
+            LOGGER(__name__).warning(
+                f"Media store over budget ({self.total}/{self.limit} bytes), remaining files are in use"
+            )
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self.entries),
+            "bytes": self.total,
+            "limit": self.limit,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+media_store = MediaStore(config.MEDIA_CACHE_LIMIT, config.MEDIA_CACHE_POLICY)
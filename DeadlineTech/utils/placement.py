@@ -0,0 +1,95 @@
+# Powered By Team DeadlineTech
+
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+import config
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.activecalls import active_calls
+from DeadlineTech.utils.database import chatsettingsdb
+from DeadlineTech.utils.health import health
+
+
+class AssistantPlacement:
+    """
+    Picks the assistant for a chat that has none yet.
+
+    Every started assistant gets a load score from its live calls, live video
+    calls and the number of chats assigned to it, each multiplied by a weight
+    from config. New chats go to the lowest score (ties are broken randomly),
+    assistants taken out of rotation by AssistantHealth are skipped.
+    """
+
+    def __init__(self, call_weight: float, video_weight: float, joined_weight: float):
+        self.call_weight = call_weight
+        self.video_weight = video_weight
+        self.joined_weight = joined_weight
+        self.joined: Counter = Counter()
+        self.placements: Counter = Counter()
+        self._loaded = False
+
+    async def _load(self):
+        # Chats assigned in earlier runs still count against their assistant
+        self._loaded = True
+        try:
+            async for row in chatsettingsdb.aggregate([
+                {"$match": {"assistant": {"$ne": None}}},
+                {"$group": {"_id": "$assistant", "chats": {"$sum": 1}}},
+            ]):
+                self.joined[int(row["_id"])] += row["chats"]
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to load assistant assignments: {e}")
+
+    def load_of(self) -> Dict[int, dict]:
+        from DeadlineTech.core.userbot import assistants
+
+        load = {}
+        for number in assistants:
+            calls, videos = active_calls.assistant_load(number)
+            score = (
+                calls * self.call_weight
+                + videos * self.video_weight
+                + self.joined[number] * self.joined_weight
+            )
+            load[number] = {
+                "calls": calls,
+                "video": videos,
+                "joined": self.joined[number],
+                "score": round(score, 2),
+            }
+        return load
+
+    async def choose(self, exclude: Iterable[int] = ()) -> Optional[int]:
+        from DeadlineTech.core.userbot import assistants
+
+        if not self._loaded:
+            await self._load()
+        load = self.load_of()
+        exclude = set(exclude) | health.unhealthy()
+        eligible = [n for n in assistants if n not in exclude] or list(assistants)
+        if not eligible:
+            return None
+        best = min(load[n]["score"] for n in eligible)
+        return random.choice([n for n in eligible if load[n]["score"] == best])
+
+    def assigned(self, old: Optional[int], new: int):
+        if old is not None and self.joined[old] > 0:
+            self.joined[old] -= 1
+        self.joined[new] += 1
+        self.placements[new] += 1
+
+    async def distribution(self) -> List[dict]:
+        if not self._loaded:
+            await self._load()
+        return [
+            {"assistant": number, "placed": self.placements[number], **stats}
+            for number, stats in sorted(self.load_of().items())
+        ]
+
+
+placement = AssistantPlacement(
+    config.PLACEMENT_CALL_WEIGHT,
+    config.PLACEMENT_VIDEO_WEIGHT,
+    config.PLACEMENT_JOINED_WEIGHT,
+)
@@ -0,0 +1,69 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from DeadlineTech.logging import LOGGER
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single in-flight task.
+
+    Every caller awaiting the same key gets the same result (or exception).
+    The shared task is cancelled only once all of its waiters have gone away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def _finish(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        task = flight.task
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+            LOGGER(__name__).warning(
+                f"[{self.name}] {key} failed for {flight.waiters} waiter(s): {task.exception()}"
+            )
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs):
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(func(*args, **kwargs)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _, k=key, f=flight: self._finish(k, f))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            LOGGER(__name__).info(f"[{self.name}] Joined in-flight request for {key}")
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+        }
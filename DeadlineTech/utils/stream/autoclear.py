@@ -1,6 +1,7 @@
 import os
 
 from config import autoclean
+from DeadlineTech.utils.mediastore import media_store
 
 
 async def auto_clean(popped):
@@ -10,6 +11,9 @@ async def auto_clean(popped):
         count = autoclean.count(rem)
         if count == 0:
             # Fixed: use 'and' instead of 'or' - file should be deleted only if it's NONE of these prefixes
+            # Cached youtube downloads are evicted by the media store once it's over budget
+            if media_store.owns(rem):
+                return
             if "vid_" not in rem and "live_" not in rem and "index_" not in rem:
                 try:
                     os.remove(rem)
@@ -0,0 +1,45 @@
+# Powered By Team DeadlineTech
+
+import time
+
+# A queue entry's position is "played" seconds at the moment "since" (monotonic)
+# was taken, plus the time elapsed since then. "since" is None while the track
+# is paused or not playing yet. Speed changes re-encode the file (speed_path),
+# so the clock always runs at 1x of the file that is being streamed.
+
+
+def _position(track: dict) -> float:
+    position = track.get("played") or 0
+    since = track.get("since")
+    if since is not None:
+        position += time.monotonic() - since
+    seconds = int(track.get("seconds") or 0)
+    if seconds:
+        position = min(position, seconds)
+    return position
+
+
+def track_position(track: dict) -> int:
+    """Seconds of the track played so far."""
+    return int(_position(track))
+
+
+def start_clock(track: dict, offset: int = 0):
+    track["played"] = offset
+    track["since"] = time.monotonic()
+
+
+def reset_clock(track: dict):
+    track["played"] = 0
+    track["since"] = None
+
+
+def pause_clock(track: dict):
+    if track.get("since") is not None:
+        track["played"] = _position(track)
+        track["since"] = None
+
+
+def resume_clock(track: dict):
+    if track.get("since") is None:
+        track["since"] = time.monotonic()
@@ -0,0 +1,94 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+import config
+from DeadlineTech import YouTube
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import db
+from DeadlineTech.utils.mediastore import media_store
+
+
+class Prefetcher:
+    """
+    Downloads the next queued youtube tracks of a chat while the current one plays,
+    so the track change finds a local file instead of waiting on the API.
+    """
+
+    def __init__(self, depth: int, concurrency: int):
+        self.depth = max(depth, 0)
+        self.semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self.tasks: Dict[int, Dict[Tuple[str, bool], asyncio.Task]] = {}
+        self.fetched = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def _wanted(self, chat_id: int) -> List[Optional[Tuple[str, bool]]]:
+        wanted = []
+        queue = db.get(chat_id) or ()
+        for track in islice(queue, 1 + self.depth):
+            if not str(track.get("file", "")).startswith("vid_"):
+                wanted.append(None)
+                continue
+            key = (track["vidid"], track.get("streamtype") == "video")
+            wanted.append(key)
+        return wanted
+
+    def schedule(self, chat_id: int):
+        """Sync the running prefetches of a chat with its current queue."""
+        wanted = self._wanted(chat_id)
+        # A prefetch of the track that just became current is kept alive,
+        # the track change joins it through the download single-flight.
+        current, wanted = (wanted[0], wanted[1:]) if wanted else (None, [])
+        wanted = [key for key in wanted if key]
+        tasks = self.tasks.setdefault(chat_id, {})
+        for key in list(tasks):
+            if key not in wanted and key != current:
+                tasks.pop(key).cancel()
+        for key in wanted:
+            if key in tasks or media_store.contains(*key):
+                continue
+            tasks[key] = asyncio.create_task(self._fetch(chat_id, *key))
+        if not tasks:
+            self.tasks.pop(chat_id, None)
+
+    def cancel(self, chat_id: int):
+        for task in self.tasks.pop(chat_id, {}).values():
+            task.cancel()
+
+    async def _fetch(self, chat_id: int, vidid: str, video: bool):
+        try:
+            async with self.semaphore:
+                LOGGER(__name__).info(f"Prefetching {vidid} for chat: {chat_id}")
+                file_path, _ = await YouTube.download(
+                    vidid, None, videoid=True, video=True if video else None, lane="prefetch"
+                )
+            if file_path:
+                self.fetched += 1
+            else:
+                self.failed += 1
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            self.failed += 1
+            LOGGER(__name__).warning(f"Prefetch failed for {vidid} in {chat_id}: {e}")
+        finally:
+            tasks = self.tasks.get(chat_id)
+            if tasks and tasks.get((vidid, video)) is asyncio.current_task():
+                del tasks[(vidid, video)]
+                if not tasks:
+                    self.tasks.pop(chat_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "running": sum(len(t) for t in self.tasks.values()),
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+        }
+
+
+prefetcher = Prefetcher(config.PREFETCH_DEPTH, config.PREFETCH_CONCURRENCY)
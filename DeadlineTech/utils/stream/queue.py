@@ -1,11 +1,88 @@
 import asyncio
-from typing import Union
+import random
+from collections import deque
+from typing import List, Union
 
 from DeadlineTech.misc import db
 from DeadlineTech.utils.formatters import check_duration, seconds_to_min
+from DeadlineTech.utils.stream.position import start_clock
+from DeadlineTech.utils.stream.prefetch import prefetcher
 from config import autoclean, time_to_seconds
 
 
+class Track:
+    """
+    One queue entry. Fields are slots instead of dict keys, but track["key"]
+    and track.get("key") keep working, an unset field reads as None.
+    """
+
+    __slots__ = (
+        "title",
+        "dur",
+        "streamtype",
+        "by",
+        "user_id",
+        "chat_id",
+        "file",
+        "vidid",
+        "seconds",
+        "played",
+        "since",
+        "mystic",
+        "markup",
+        "old_dur",
+        "old_second",
+        "speed_path",
+        "speed",
+    )
+
+    def __init__(self, **fields):
+        for key in self.__slots__:
+            setattr(self, key, None)
+        for key, value in fields.items():
+            self[key] = value
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        try:
+            setattr(self, key, value)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return getattr(self, key, None) is not None
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+
+class ChatQueue(deque):
+    """A chat's queue, the head is the track that is playing."""
+
+    __slots__ = ()
+
+    def skip(self, count: int) -> List[Track]:
+        """Pops up to count tracks from the head."""
+        return [self.popleft() for _ in range(min(count, len(self)))]
+
+    def shuffle_upcoming(self):
+        """Shuffles everything after the playing track."""
+        if len(self) < 3:
+            return
+        head = self.popleft()
+        upcoming = list(self)
+        random.shuffle(upcoming)
+        self.clear()
+        self.append(head)
+        self.extend(upcoming)
+
+
 async def put_queue(
     chat_id,
     original_chat_id,
@@ -23,28 +100,31 @@ async def put_queue(
         duration_in_seconds = time_to_seconds(duration) - 3
     except:
         duration_in_seconds = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "user_id": user_id,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": duration_in_seconds,
-        "played": 0,
-    }
+    put = Track(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        user_id=user_id,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=duration_in_seconds,
+        played=0,
+    )
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
+            db[chat_id] = ChatQueue()
             db[chat_id].append(put)
     else:
         db[chat_id].append(put)
+    if db[chat_id][0] is put:
+        start_clock(put)
     autoclean.append(file)
+    prefetcher.schedule(chat_id)
 
 
 async def put_queue_index(
@@ -69,23 +149,25 @@ async def put_queue_index(
             dur = 0
     else:
         dur = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": dur,
-        "played": 0,
-    }
+    put = Track(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=dur,
+        played=0,
+    )
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
+            db[chat_id] = ChatQueue()
             db[chat_id].append(put)
     else:
         db[chat_id].append(put)
+    if db[chat_id][0] is put:
+        start_clock(put)
@@ -0,0 +1,115 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+import os
+import socket
+import time
+from typing import Optional
+from urllib.parse import quote, unquote
+
+import aiofiles
+from aiohttp import web
+
+import config
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.mediastore import media_store
+
+CHUNK_SIZE = 64 * 1024
+POLL_INTERVAL = 0.2
+
+
+class GrowingRelay:
+    """
+    Serves media store files that are still downloading to ffmpeg over loopback
+    HTTP.
+
+    The response follows the `.part` file as it grows and ends as soon as the
+    download settles, so ffmpeg sees a normal end of file right after the last
+    byte instead of waiting on the file for more data. If the download stops
+    growing for PROGRESSIVE_READ_TIMEOUT seconds the connection is dropped,
+    which ends the stream like any other read error.
+    """
+
+    def __init__(self, stall_timeout: int):
+        self.stall_timeout = stall_timeout
+        self.runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+        self.served = 0
+        self.stalls = 0
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/{path:.+}", self._serve)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        await web.SockSite(self.runner, sock).start()
+        self.port = sock.getsockname()[1]
+        LOGGER(__name__).info(f"Progressive playback relay listening on 127.0.0.1:{self.port}")
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+        self.runner = None
+        self.port = None
+
+    def url_for(self, path) -> Optional[str]:
+        """Loopback URL ffmpeg can read a growing file from, None if the relay isn't running."""
+        if self.port is None:
+            return None
+        return f"http://127.0.0.1:{self.port}/{quote(media_store._key(path))}"
+
+    async def _serve(self, request: web.Request):
+        key = os.path.normpath(unquote(request.match_info["path"]))
+        growing = media_store.growing_file(key)
+        if growing is None:
+            # Finished before ffmpeg got here (or a probe came late)
+            if key in media_store.entries and os.path.exists(key):
+                return web.FileResponse(key)
+            raise web.HTTPNotFound()
+
+        try:
+            f = await aiofiles.open(growing.read_path, "rb")
+        except FileNotFoundError:
+            # Renamed into place in the meantime
+            try:
+                f = await aiofiles.open(key, "rb")
+            except FileNotFoundError:
+                raise web.HTTPNotFound()
+
+        resp = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        self.served += 1
+        try:
+            await resp.prepare(request)
+            last_data = time.monotonic()
+            while True:
+                # Checked before reading, so bytes written just before the
+                # download finished are still sent
+                settled = growing.task is not None and growing.task.done()
+                chunk = await f.read(CHUNK_SIZE)
+                if chunk:
+                    await resp.write(chunk)
+                    last_data = time.monotonic()
+                    continue
+                if settled:
+                    break
+                if time.monotonic() - last_data > self.stall_timeout:
+                    self.stalls += 1
+                    LOGGER(__name__).warning(f"Download of {key} stalled, ending its stream")
+                    request.transport.close()
+                    return resp
+                await asyncio.sleep(POLL_INTERVAL)
+            await resp.write_eof()
+        except (ConnectionResetError, ConnectionError):
+            # ffmpeg (or a probe) closed its end
+            pass
+        finally:
+            await f.close()
+        return resp
+
+    def stats(self) -> dict:
+        return {"port": self.port, "served": self.served, "stalls": self.stalls}
+
+
+stream_relay = GrowingRelay(config.PROGRESSIVE_READ_TIMEOUT)
@@ -0,0 +1,183 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+
+import config
+from DeadlineTech.core.mongo import mongodb
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import db
+from DeadlineTech.utils.actor import actors
+from DeadlineTech.utils.database import get_active_chats, is_active_video_chat
+from DeadlineTech.utils.stream.position import track_position
+from DeadlineTech.utils.stream.queue import ChatQueue, Track
+
+HEARTBEAT = "heartbeat"
+# Per-run state that means nothing after a restart
+VOLATILE = ("played", "since", "mystic", "markup")
+
+
+class QueueSnapshots:
+    """
+    Persists every active chat's queue and position so a restart or crash can
+    pick up where it left off.
+
+    Each chat is one document. A flush only rewrites chats whose queue or clock
+    changed since the last flush: a playing head is stored as the wall time it
+    started at, which stays the same while it plays. A heartbeat document
+    records when the last flush ran, i.e. roughly when the bot went down.
+    """
+
+    def __init__(self, interval: int, concurrency: int, max_age: int):
+        self.collection = mongodb.queuesnapshots
+        self.interval = interval
+        self.concurrency = max(concurrency, 1)
+        self.max_age = max_age
+        self.saved: Dict[int, tuple] = {}
+        self.task: Optional[asyncio.Task] = None
+        self.closed = False
+        self.writes = 0
+        self.resumed = 0
+        self.failed = 0
+
+    @staticmethod
+    def _fingerprint(queue: ChatQueue, video: bool) -> tuple:
+        head = queue[0]
+        return (tuple(map(id, queue)), head.played, head.since, head.speed_path, video)
+
+    @staticmethod
+    def _document(chat_id: int, queue: ChatQueue, video: bool, now: float) -> dict:
+        head = queue[0]
+        position = track_position(head)
+        document = {
+            "_id": chat_id,
+            "tracks": [
+                {key: track[key] for key in Track.__slots__ if key not in VOLATILE and key in track}
+                for track in queue
+            ],
+            "video": video,
+            "paused": head.since is None,
+        }
+        if head.since is None:
+            document["position"] = position
+        else:
+            document["started_at"] = now - position
+        return document
+
+    async def flush(self):
+        if self.closed:
+            return
+        now = time.time()
+        ops = []
+        live = set()
+        for chat_id in list(await get_active_chats()):
+            queue = db.get(chat_id)
+            if not queue:
+                continue
+            live.add(chat_id)
+            video = await is_active_video_chat(chat_id)
+            fingerprint = self._fingerprint(queue, video)
+            if self.saved.get(chat_id) == fingerprint:
+                continue
+            ops.append(ReplaceOne({"_id": chat_id}, self._document(chat_id, queue, video, now), upsert=True))
+            self.saved[chat_id] = fingerprint
+        for chat_id in [chat_id for chat_id in self.saved if chat_id not in live]:
+            ops.append(DeleteOne({"_id": chat_id}))
+            del self.saved[chat_id]
+        ops.append(UpdateOne({"_id": HEARTBEAT}, {"$set": {"at": now}}, upsert=True))
+        try:
+            await self.collection.bulk_write(ops, ordered=False)
+            self.writes += len(ops) - 1
+        except Exception as e:
+            # Rewrite everything next time, whatever made it is still correct
+            self.saved.clear()
+            LOGGER(__name__).warning(f"Failed to save queue snapshots: {e}")
+
+    async def resume(self):
+        from DeadlineTech.core.call import Anony
+
+        heartbeat = await self.collection.find_one({"_id": HEARTBEAT})
+        stopped_at = heartbeat["at"] if heartbeat else time.time()
+        if time.time() - stopped_at > self.max_age:
+            LOGGER(__name__).info("Saved queues are too old to resume, dropping them")
+            await self.collection.delete_many({"_id": {"$ne": HEARTBEAT}})
+            return
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def restore(document):
+            chat_id = document["_id"]
+            queue = ChatQueue(Track(**fields) for fields in document["tracks"])
+            if not queue:
+                return
+            if document.get("paused"):
+                position = document.get("position", 0)
+            else:
+                position = stopped_at - document.get("started_at", stopped_at)
+            async with semaphore:
+                resumed = await actors.run(
+                    chat_id,
+                    Anony.restore,
+                    chat_id,
+                    queue,
+                    max(int(position), 0),
+                    document.get("video", False),
+                    document.get("paused", False),
+                )
+            if resumed:
+                self.resumed += 1
+            else:
+                self.failed += 1
+                await self.collection.delete_one({"_id": chat_id})
+
+        documents = [
+            document
+            async for document in self.collection.find({"_id": {"$ne": HEARTBEAT}})
+        ]
+        if not documents:
+            return
+        LOGGER(__name__).info(f"Resuming {len(documents)} saved queue(s)...")
+        await asyncio.gather(*(restore(document) for document in documents), return_exceptions=True)
+        LOGGER(__name__).info(f"Resumed {self.resumed} queue(s), {self.failed} couldn't be resumed")
+
+    async def _run(self):
+        try:
+            await self.resume()
+        except Exception as e:
+            LOGGER(__name__).error(f"Failed to resume saved queues: {e}")
+        while not self.closed:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Queue snapshot failed: {e}")
+
+    def start(self):
+        if self.interval > 0 and self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Writes a last snapshot and stops saving, called before the process goes down."""
+        if self.interval <= 0 or self.closed:
+            return
+        await self.flush()
+        self.closed = True
+        if self.task:
+            self.task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "chats": len(self.saved),
+            "writes": self.writes,
+            "resumed": self.resumed,
+            "failed": self.failed,
+        }
+
+
+queue_snapshots = QueueSnapshots(
+    config.QUEUE_SNAPSHOT_INTERVAL,
+    config.QUEUE_RESUME_CONCURRENCY,
+    config.QUEUE_RESUME_MAX_AGE,
+)
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Union
 
 from pyrogram.types import InlineKeyboardMarkup
@@ -6,11 +7,72 @@ import config
 from DeadlineTech import YouTube, app
 from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import db
-from DeadlineTech.utils.database import add_active_video_chat, is_active_chat
+from DeadlineTech.utils.actor import actors
+from DeadlineTech.utils.database import is_active_chat
 from DeadlineTech.utils.exceptions import AssistantErr
 from DeadlineTech.utils.inline import aq_markup, close_markup, stream_markup
 from DeadlineTech.utils.pastebin import AnonyBin
-from DeadlineTech.utils.stream.queue import put_queue, put_queue_index
+from DeadlineTech.utils.stream.queue import ChatQueue, put_queue, put_queue_index
+
+
+async def _play_or_queue(
+    _,
+    chat_id,
+    original_chat_id,
+    source,
+    queued,
+    title,
+    duration_min,
+    user_name,
+    vidid,
+    user_id,
+    video,
+    forceplay,
+    link,
+    markup,
+):
+    """
+    Runs on the chat's actor. Queues the track if the chat is playing, else joins
+    the call with source. Returns the queue position (0 when it started playing),
+    or None when the call has to be joined but source wasn't fetched.
+    """
+    if forceplay:
+        if source is None:
+            return None
+        await Anony.force_stop_stream(chat_id)
+    elif await is_active_chat(chat_id):
+        await put_queue(
+            chat_id, original_chat_id, queued, title, duration_min, user_name, vidid, user_id, "video" if video else "audio"
+        )
+        return len(db.get(chat_id)) - 1
+    elif source is None:
+        return None
+    else:
+        db[chat_id] = ChatQueue()
+    await Anony.join_call(chat_id, original_chat_id, source, video=True if video else None)
+    await put_queue(
+        chat_id, original_chat_id, queued, title, duration_min, user_name, vidid, user_id, "video" if video else "audio", forceplay=forceplay
+    )
+    button = stream_markup(_, chat_id)
+    run = await app.send_message(
+        original_chat_id,
+        text=_["stream_1"].format(link, title[:23], duration_min, user_name),
+        reply_markup=InlineKeyboardMarkup(button),
+        disable_web_page_preview=True
+    )
+    db[chat_id][0]["mystic"] = run.id
+    db[chat_id][0]["markup"] = markup
+    return 0
+
+
+async def _queued_message(_, chat_id, original_chat_id, position, title, duration_min, user_name):
+    button = aq_markup(_, chat_id)
+    await app.send_message(
+        chat_id=original_chat_id,
+        text=_["queue_4"].format(position, title[:27], duration_min, user_name),
+        reply_markup=InlineKeyboardMarkup(button),
+        disable_web_page_preview=True
+    )
 
 
 async def stream(
@@ -26,55 +88,68 @@ async def stream(
     spotify: Union[bool, str] = None,
     forceplay: Union[bool, str] = None,
 ):
+    # Lookups and downloads happen here, only adding to the queue or joining
+    # the call runs on the chat's actor, so skips and stream ends never wait
+    # behind a download.
     if not result:
         return
-    if forceplay:
-        await Anony.force_stop_stream(chat_id)
-        
+    status = True if video else None
+
     if streamtype == "playlist":
         msg = f"{_['play_19']}\n\n"
         count = 0
-        for search in result:
-            if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
-            try:
-                (title, duration_min, duration_sec, _, vidid) = await YouTube.details(search, False if spotify else True)
-            except:
-                continue
-            if str(duration_min) == "None":
-                continue
-            if duration_sec > config.DURATION_LIMIT:
-                continue
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id, original_chat_id, f"vid_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio"
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}. {title[:70]}\n"
-                msg += f"{_['play_20']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
+        semaphore = asyncio.Semaphore(config.PLAYLIST_RESOLVE_CONCURRENCY)
+
+        async def resolve(search):
+            async with semaphore:
                 try:
-                    file_path, direct = await YouTube.download(vidid, mystic, video=status, videoid=True)
+                    return await YouTube.details(search, False if spotify else True)
                 except:
-                    raise AssistantErr(_["play_14"])
-                await Anony.join_call(chat_id, original_chat_id, file_path, video=status)
-                await put_queue(
-                    chat_id, original_chat_id, file_path if direct else f"vid_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio", forceplay=forceplay
-                )
-                
-                button = stream_markup(_, chat_id)
-                run = await app.send_message(
-                    original_chat_id,
-                    text=_["stream_1"].format(f"https://t.me/{app.username}?start=info_{vidid}", title[:23], duration_min, user_name),
-                    reply_markup=InlineKeyboardMarkup(button),
-                    disable_web_page_preview=True
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+                    return None
+
+        async def download(vidid):
+            try:
+                file_path, direct = await YouTube.download(vidid, mystic, video=status, videoid=True, progressive=True)
+            except:
+                raise AssistantErr(_["play_14"])
+            return file_path, file_path if direct else f"vid_{vidid}"
+
+        # Every entry is looked up concurrently but consumed in playlist order,
+        # so the first track starts playing while the rest are still resolving.
+        lookups = [asyncio.ensure_future(resolve(search)) for search in result]
+        try:
+            for lookup in lookups:
+                if int(count) == config.PLAYLIST_FETCH_LIMIT:
+                    break
+                details = await lookup
+                if not details:
+                    continue
+                (title, duration_min, duration_sec, thumbnail, vidid) = details
+                if not vidid or str(duration_min) == "None":
+                    continue
+                if duration_sec > config.DURATION_LIMIT:
+                    continue
+                source, queued = None, f"vid_{vidid}"
+                if forceplay or not await is_active_chat(chat_id):
+                    source, queued = await download(vidid)
+                while True:
+                    added = await actors.run(
+                        chat_id, _play_or_queue, _, chat_id, original_chat_id, source, queued, title, duration_min, user_name, vidid, user_id, video, forceplay,
+                        f"https://t.me/{app.username}?start=info_{vidid}", "stream"
+                    )
+                    if added is not None:
+                        break
+                    # The call ended while this entry was resolving
+                    source, queued = await download(vidid)
+                forceplay = None
+                if added:
+                    position = added
+                    count += 1
+                    msg += f"{count}. {title[:70]}\n"
+                    msg += f"{_['play_20']} {position}\n\n"
+        finally:
+            for lookup in lookups:
+                lookup.cancel()
         if count == 0:
             return
         else:
@@ -86,119 +161,60 @@ async def stream(
                 reply_markup=upl,
                 disable_web_page_preview=True
             )
-            
+
     elif streamtype == "youtube":
         link = result["link"]
         vidid = result["vidid"]
         title = (result["title"]).title()
         duration_min = result["duration_min"]
-        status = True if video else None
         try:
-            file_path, direct = await YouTube.download(vidid, mystic, videoid=True, video=status)
+            file_path, direct = await YouTube.download(
+                vidid, mystic, videoid=True, video=status, progressive=forceplay or not await is_active_chat(chat_id)
+            )
         except Exception as ex:
             raise AssistantErr(_["play_14"])
-            
-        if await is_active_chat(chat_id):
-            await put_queue(
-                chat_id, original_chat_id, file_path if direct else f"vid_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio"
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await app.send_message(
-                chat_id=original_chat_id,
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
-            await Anony.join_call(chat_id, original_chat_id, file_path, video=status)
-            await put_queue(
-                chat_id, original_chat_id, file_path if direct else f"vid_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio", forceplay=forceplay
-            )
-            
-            button = stream_markup(_, chat_id)
-            run = await app.send_message(
-                original_chat_id,
-                text=_["stream_1"].format(f"https://t.me/{app.username}?start=info_{vidid}", title[:23], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "stream"
-            
+        queued = file_path if direct else f"vid_{vidid}"
+        position = await actors.run(
+            chat_id, _play_or_queue, _, chat_id, original_chat_id, file_path, queued, title, duration_min, user_name, vidid, user_id, video, forceplay,
+            f"https://t.me/{app.username}?start=info_{vidid}", "stream"
+        )
+        if position:
+            await _queued_message(_, chat_id, original_chat_id, position, title, duration_min, user_name)
+
     elif streamtype == "telegram":
         file_path = result["path"]
         link = result["link"]
         title = (result["title"]).title()
         duration_min = result["dur"]
-        status = True if video else None
-        if await is_active_chat(chat_id):
-            await put_queue(
-                chat_id, original_chat_id, file_path, title, duration_min, user_name, streamtype, user_id, "video" if video else "audio"
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await app.send_message(
-                chat_id=original_chat_id,
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
-            await Anony.join_call(chat_id, original_chat_id, file_path, video=status)
-            await put_queue(
-                chat_id, original_chat_id, file_path, title, duration_min, user_name, streamtype, user_id, "video" if video else "audio", forceplay=forceplay
-            )
-            if video:
-                await add_active_video_chat(chat_id)
-            button = stream_markup(_, chat_id)
-            run = await app.send_message(
-                original_chat_id,
-                text=_["stream_1"].format(link, title[:23], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
-            
+        position = await actors.run(
+            chat_id, _play_or_queue, _, chat_id, original_chat_id, file_path, file_path, title, duration_min, user_name, streamtype, user_id, video, forceplay,
+            link, "tg"
+        )
+        if position:
+            await _queued_message(_, chat_id, original_chat_id, position, title, duration_min, user_name)
+
     elif streamtype == "live":
         link = result["link"]
         vidid = result["vidid"]
         title = (result["title"]).title()
         duration_min = "Live Track"
-        status = True if video else None
-        if await is_active_chat(chat_id):
-            await put_queue(
-                chat_id, original_chat_id, f"live_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio"
-            )
-            position = len(db.get(chat_id)) - 1
-            button = aq_markup(_, chat_id)
-            await app.send_message(
-                chat_id=original_chat_id,
-                text=_["queue_4"].format(position, title[:27], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
-            )
-        else:
-            if not forceplay:
-                db[chat_id] = []
+
+        async def resolve_live():
             n, file_path = await YouTube.video(link)
             if n == 0:
                 raise AssistantErr(_["str_3"])
-            await Anony.join_call(chat_id, original_chat_id, file_path, video=status)
-            await put_queue(
-                chat_id, original_chat_id, f"live_{vidid}", title, duration_min, user_name, vidid, user_id, "video" if video else "audio", forceplay=forceplay
-            )
-            button = stream_markup(_, chat_id)
-            run = await app.send_message(
-                original_chat_id,
-                text=_["stream_1"].format(f"https://t.me/{app.username}?start=info_{vidid}", title[:23], duration_min, user_name),
-                reply_markup=InlineKeyboardMarkup(button),
-                disable_web_page_preview=True
+            return file_path
+
+        source = None
+        if forceplay or not await is_active_chat(chat_id):
+            source = await resolve_live()
+        while True:
+            position = await actors.run(
+                chat_id, _play_or_queue, _, chat_id, original_chat_id, source, f"live_{vidid}", title, duration_min, user_name, vidid, user_id, video, forceplay,
+                f"https://t.me/{app.username}?start=info_{vidid}", "tg"
             )
-            db[chat_id][0]["mystic"] = run
-            db[chat_id][0]["markup"] = "tg"
+            if position is not None:
+                break
+            source = await resolve_live()
+        if position:
+            await _queued_message(_, chat_id, original_chat_id, position, title, duration_min, user_name)
@@ -0,0 +1,264 @@
+# Powered By Team DeadlineTech
+
+import asyncio
+import heapq
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import config
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.mediastore import media_store
+
+WORKER_SCRIPT = str(Path(__file__).with_name("ytdlp_worker.py"))
+
+# Lower value is served first when workers are scarce
+LANES = {"interactive": 0, "prefetch": 1, "playlist": 2}
+# Lanes that together never take the last worker, it's kept for /play
+BACKGROUND = ("prefetch", "playlist")
+
+
+class _Worker:
+    __slots__ = ("proc", "jobs")
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.jobs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    def kill(self):
+        try:
+            self.proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class _LaneStats:
+    __slots__ = ("waiting", "running", "done", "failed", "timeouts", "wait_time")
+
+    def __init__(self):
+        self.waiting = 0
+        self.running = 0
+        self.done = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+
+
+class YtDlpPool:
+    """
+    Persistent yt-dlp worker processes shared by all youtube extraction and downloads.
+
+    Jobs are queued per lane, an idle worker always goes to the most important
+    waiting lane first and every lane has its own concurrency cap. The
+    background lanes also share one cap of size - 1, so they can't occupy
+    every worker between them. A job that runs past its timeout (or whose
+    caller goes away) gets its worker killed and its partial download
+    removed, a replacement is spawned on demand.
+    """
+
+    def __init__(self, size: int, limits: Dict[str, int]):
+        if size < 2:
+            LOGGER(__name__).warning("YTDLP_WORKERS is below 2, running 2 so /play always has a free worker")
+        self.size = max(size, 2)
+        self.lanes = {lane: asyncio.Semaphore(max(limits.get(lane, self.size), 1)) for lane in LANES}
+        self.background = asyncio.Semaphore(self.size - 1)
+        self.stats_by_lane = {lane: _LaneStats() for lane in LANES}
+        self.workers: List[_Worker] = []
+        self.idle: List[_Worker] = []
+        self._waiting: list = []
+        self._seq = itertools.count()
+        self._job_ids = itertools.count(1)
+        self._spawning = 0
+        self.respawns = 0
+
+    async def _spawn(self) -> _Worker:
+        self._spawning += 1
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, WORKER_SCRIPT,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                limit=16 * 1024 * 1024,
+            )
+        finally:
+            self._spawning -= 1
+        worker = _Worker(proc)
+        self.workers.append(worker)
+        LOGGER(__name__).info(f"Started yt-dlp worker (pid {proc.pid}), {len(self.workers)}/{self.size}")
+        return worker
+
+    async def _acquire(self, lane: str) -> _Worker:
+        while self.idle:
+            worker = self.idle.pop()
+            if worker.alive:
+                return worker
+            self._discard(worker)
+        if len(self.workers) + self._spawning < self.size:
+            return await self._spawn()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (LANES[lane], next(self._seq), future))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(future.result())
+            raise
+
+    def _release(self, worker: _Worker):
+        if not worker.alive:
+            self._discard(worker)
+            if self._waiting:
+                # Hand the freed slot to the next waiter as a fresh worker
+                asyncio.ensure_future(self._respawn_for_waiter())
+            return
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(worker)
+                return
+        self.idle.append(worker)
+
+    async def _respawn_for_waiter(self):
+        try:
+            worker = await self._spawn()
+        except Exception as e:
+            LOGGER(__name__).error(f"Failed to respawn yt-dlp worker: {e}")
+            return
+        self.respawns += 1
+        self._release(worker)
+
+    def _discard(self, worker: _Worker):
+        if worker in self.workers:
+            self.workers.remove(worker)
+        if worker in self.idle:
+            self.idle.remove(worker)
+
+    async def run(self, lane: str, op: str, timeout: float, **args) -> Any:
+        """Runs `op` from ytdlp_worker.py in a worker process and returns its result."""
+        stats = self.stats_by_lane[lane]
+        queued = time.monotonic()
+        stats.waiting += 1
+        shared = self.background if lane in BACKGROUND else None
+        # The lane (and shared background) slots are held until the job is done,
+        # so the caps limit running jobs and not just the wait for a worker
+        held = []
+        try:
+            await self.lanes[lane].acquire()
+            held.append(self.lanes[lane])
+            if shared:
+                await shared.acquire()
+                held.append(shared)
+            worker = await self._acquire(lane)
+        except BaseException:
+            for semaphore in held:
+                semaphore.release()
+            raise
+        finally:
+            stats.waiting -= 1
+        stats.wait_time += time.monotonic() - queued
+        stats.running += 1
+        try:
+            result = await asyncio.wait_for(self._call(worker, op, args), timeout=timeout)
+            stats.done += 1
+            return result
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            LOGGER(__name__).error(f"yt-dlp {op} timed out after {timeout}s, killing worker {worker.proc.pid}")
+            worker.kill()
+            raise
+        except asyncio.CancelledError:
+            worker.kill()
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.running -= 1
+            try:
+                if not worker.alive:
+                    await worker.proc.wait()
+                    if args.get("out_path"):
+                        self._remove_partial(args["out_path"])
+            finally:
+                self._release(worker)
+                for semaphore in held:
+                    semaphore.release()
+
+    @staticmethod
+    def _remove_partial(out_path: str):
+        # A killed download leaves "<out>.part", "<out>.ytdl", fragments and
+        # per-format files like "<vidid>.f137.mp4" next to the output, the
+        # output itself only exists once yt-dlp has finished
+        out = Path(out_path)
+        if not out.parent.is_dir():
+            return
+        reading = {growing.read_path for growing in media_store.growing.values()}
+        for file in out.parent.iterdir():
+            if file == out or not file.name.startswith(f"{out.stem}."):
+                continue
+            if media_store._key(file) in reading:
+                continue
+            try:
+                file.unlink()
+            except OSError as e:
+                LOGGER(__name__).warning(f"Failed to remove {file}: {e}")
+
+    async def _call(self, worker: _Worker, op: str, args: dict) -> Any:
+        job_id = next(self._job_ids)
+        worker.jobs += 1
+        worker.proc.stdin.write((json.dumps({"id": job_id, "op": op, "args": args}) + "\n").encode())
+        await worker.proc.stdin.drain()
+        line = await worker.proc.stdout.readline()
+        if not line:
+            worker.kill()
+            raise RuntimeError(f"yt-dlp worker {worker.proc.pid} exited")
+        reply = json.loads(line)
+        if reply.get("id") != job_id:
+            worker.kill()
+            raise RuntimeError("yt-dlp worker replied out of order")
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+        return reply.get("result")
+
+    async def close(self):
+        for worker in list(self.workers):
+            worker.kill()
+        for worker in list(self.workers):
+            await worker.proc.wait()
+        self.workers.clear()
+        self.idle.clear()
+
+    def stats(self) -> dict:
+        return {
+            "workers": len(self.workers),
+            "idle": len(self.idle),
+            "respawns": self.respawns,
+            "lanes": {
+                lane: {
+                    "waiting": s.waiting,
+                    "running": s.running,
+                    "done": s.done,
+                    "failed": s.failed,
+                    "timeouts": s.timeouts,
+                    "avg_wait": round(s.wait_time / max(s.done + s.failed + s.timeouts, 1), 3),
+                }
+                for lane, s in self.stats_by_lane.items()
+            },
+        }
+
+
+ytdlp_pool = YtDlpPool(
+    config.YTDLP_WORKERS,
+    {
+        "interactive": config.YTDLP_WORKERS,
+        "prefetch": config.YTDLP_WORKERS - 1,
+        "playlist": config.YTDLP_PLAYLIST_WORKERS,
+    },
+)
@@ -0,0 +1,86 @@
+# Powered By Team DeadlineTech
+
+# Long lived yt-dlp worker, started by DeadlineTech.utils.ytdlp_pool as
+# `python ytdlp_worker.py`. It reads one JSON job per line on stdin and writes
+# one JSON reply per line on stdout. It must not import the bot package.
+
+import json
+import os
+import sys
+
+import yt_dlp
+
+
+def download(link: str, out_path: str, cookie_file: str, format_id: str = None):
+    ydl_opts = {
+        "format": format_id if format_id else "bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best",
+        "outtmpl": out_path,
+        "cookiefile": cookie_file,
+        "quiet": True,
+        "no_warnings": True,
+    }
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        ydl.download([link])
+    return True
+
+
+def formats(link: str, cookie_file: str):
+    ytdl_opts = {"quiet": True, "cookiefile": cookie_file}
+    out = []
+    with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
+        r = ydl.extract_info(link, download=False)
+        for f in r.get("formats", []):
+            if "dash" in str(f.get("format")).lower():
+                continue
+            out.append({
+                "format": f.get("format"), "filesize": f.get("filesize"),
+                "format_id": f.get("format_id"), "ext": f.get("ext"),
+                "format_note": f.get("format_note"), "yturl": link
+            })
+    return out
+
+
+def playlist(link: str, cookie_file: str, limit: int):
+    ytdl_opts = {
+        "quiet": True,
+        "cookiefile": cookie_file,
+        "extract_flat": "in_playlist",
+        "playlistend": limit,
+        "ignoreerrors": True,
+    }
+    with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
+        r = ydl.extract_info(link, download=False) or {}
+    return [
+        {"id": e.get("id"), "title": e.get("title"), "duration": e.get("duration")}
+        for e in r.get("entries") or []
+        if e and e.get("id")
+    ]
+
+
+OPS = {
+    "download": download,
+    "formats": formats,
+    "playlist": playlist,
+}
+
+
+def main():
+    # Keep the real stdout for replies, anything yt-dlp (or ffmpeg) prints goes to stderr
+    replies = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        try:
+            result = OPS[job["op"]](**job.get("args", {}))
+            reply = {"id": job["id"], "ok": True, "result": result}
+        except Exception as e:
+            reply = {"id": job["id"], "ok": False, "error": f"{type(e).__name__}: {e}"}
+        replies.write(json.dumps(reply) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import re
-from os import getenv
+from os import environ, getenv
 
 from dotenv import load_dotenv
 from pyrogram import filters
@@ -57,6 +57,25 @@ SPOTIFY_CLIENT_SECRET = getenv("SPOTIFY_CLIENT_SECRET", None)
 
 # Maximum limit for fetching playlist's track from youtube, spotify, apple links.
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", 25))
+# How many playlist tracks are looked up at the same time while queueing a playlist
+PLAYLIST_RESOLVE_CONCURRENCY = int(getenv("PLAYLIST_RESOLVE_CONCURRENCY", 5))
+
+
+# Weights used to pick the least loaded assistant for a new chat: per live call,
+# extra per live video call and per chat already assigned to the assistant
+PLACEMENT_CALL_WEIGHT = float(getenv("PLACEMENT_CALL_WEIGHT", 1.0))
+PLACEMENT_VIDEO_WEIGHT = float(getenv("PLACEMENT_VIDEO_WEIGHT", 1.5))
+PLACEMENT_JOINED_WEIGHT = float(getenv("PLACEMENT_JOINED_WEIGHT", 0.01))
+# Consecutive call failures after which an assistant's chats are moved to another assistant
+ASSISTANT_FAILURE_THRESHOLD = int(getenv("ASSISTANT_FAILURE_THRESHOLD", 2))
+# Seconds a failing assistant stays out of rotation
+ASSISTANT_COOLDOWN = int(getenv("ASSISTANT_COOLDOWN", 300))
+# Seconds between saves of the active queues, resumed after a restart (0 disables)
+QUEUE_SNAPSHOT_INTERVAL = int(getenv("QUEUE_SNAPSHOT_INTERVAL", 15))
+# Chats rejoined at the same time when resuming saved queues
+QUEUE_RESUME_CONCURRENCY = int(getenv("QUEUE_RESUME_CONCURRENCY", 3))
+# Saved queues older than this (seconds) are dropped instead of resumed
+QUEUE_RESUME_MAX_AGE = int(getenv("QUEUE_RESUME_MAX_AGE", 1800))
 
 
 # Telegram audio and video file size limit (in bytes)
@@ -65,12 +84,67 @@ TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 1073741824))
 # Checkout https://www.gbmb.org/mb-to-bytes for converting mb to bytes
 
 
+# Disk budget for cached youtube downloads (in bytes), older files are evicted once it's exceeded
+MEDIA_CACHE_LIMIT = int(getenv("MEDIA_CACHE_LIMIT", 5368709120))
+# Eviction policy for the download cache, "lru" (least recently played) or "lfu" (least played)
+MEDIA_CACHE_POLICY = getenv("MEDIA_CACHE_POLICY", "lru").lower()
+
+# How many upcoming queued tracks to download in the background while the current one plays
+PREFETCH_DEPTH = int(getenv("PREFETCH_DEPTH", 1))
+# Maximum number of background prefetch downloads running at once (across all chats)
+PREFETCH_CONCURRENCY = int(getenv("PREFETCH_CONCURRENCY", 3))
+
+# Start playing audio while it's still being downloaded instead of waiting for the whole file
+PROGRESSIVE_PLAYBACK = getenv("PROGRESSIVE_PLAYBACK", "True").lower() == "true"
+# Bytes that must be on disk before playback of a file that is still downloading starts
+PROGRESSIVE_MIN_BYTES = int(getenv("PROGRESSIVE_MIN_BYTES", 262144))
+# Seconds playback waits for more data when it catches up with the download before giving up
+PROGRESSIVE_READ_TIMEOUT = int(getenv("PROGRESSIVE_READ_TIMEOUT", 10))
+
+# Parallel ranged connections used for large CDN downloads (1 disables splitting)
+CDN_CONNECTIONS = int(getenv("CDN_CONNECTIONS", 4))
+# Files smaller than this (in bytes) are always downloaded over a single connection
+CDN_PARALLEL_MIN_SIZE = int(getenv("CDN_PARALLEL_MIN_SIZE", 16777216))
+
+# Number of youtube search results kept in memory (by video id and by search query)
+YT_META_CACHE_SIZE = int(getenv("YT_META_CACHE_SIZE", 2000))
+# Seconds a cached youtube search result stays valid
+YT_META_CACHE_TTL = int(getenv("YT_META_CACHE_TTL", 21600))
+# Seconds a search query -> video mapping is kept in the database before it's searched again
+QUERY_CACHE_TTL = int(getenv("QUERY_CACHE_TTL", 604800))
+# Number of search query mappings kept in memory in front of the database
+QUERY_CACHE_SIZE = int(getenv("QUERY_CACHE_SIZE", 5000))
+# Chats whose settings are kept in memory (language, play mode, skip mode, ...)
+SETTINGS_CACHE_SIZE = int(getenv("SETTINGS_CACHE_SIZE", 50000))
+# Seconds a cached setting is trusted before it's read again (0 keeps it until evicted)
+SETTINGS_CACHE_TTL = int(getenv("SETTINGS_CACHE_TTL", 0))
+# Seconds after which a stored spotify track -> youtube video match is looked up again
+SPOTIFY_MAP_TTL = int(getenv("SPOTIFY_MAP_TTL", 2592000))
+
+# Number of background yt-dlp worker processes (video downloads, formats and playlists),
+# at least 2: prefetch and playlist work together always leave one free for /play
+YTDLP_WORKERS = int(getenv("YTDLP_WORKERS", 2))
+# How many of those workers playlist extraction may occupy at once
+YTDLP_PLAYLIST_WORKERS = int(getenv("YTDLP_PLAYLIST_WORKERS", 1))
+
+
 # Get your pyrogram v2 session from @StringFatherBot on Telegram
-STRING1 = getenv("STRING_SESSION", None)
-STRING2 = getenv("STRING_SESSION2", None)
-STRING3 = getenv("STRING_SESSION3", None)
-STRING4 = getenv("STRING_SESSION4", None)
-STRING5 = getenv("STRING_SESSION5", None)
+# Set STRING_SESSION, STRING_SESSION2, STRING_SESSION3 ... for as many assistants as you need
+STRING_SESSIONS = {}
+for key, value in sorted(environ.items()):
+    match = re.fullmatch(r"STRING_SESSION(\d*)", key)
+    if not value or not match:
+        continue
+    number = int(match.group(1) or 1)
+    if number < 1:
+        raise SystemExit(f"[ERROR] - {key} isn't a valid assistant, assistants are numbered from 1 (STRING_SESSION or STRING_SESSION1).")
+    if number in STRING_SESSIONS:
+        raise SystemExit(
+            f"[ERROR] - {key} and another variable are both assistant {number}. "
+            "STRING_SESSION and STRING_SESSION1 are the same assistant, set only one of them."
+        )
+    STRING_SESSIONS[number] = value
+STRING_SESSIONS = dict(sorted(STRING_SESSIONS.items()))
 
 
 BANNED_USERS = filters.user()
@@ -0,0 +1,171 @@
+# Powered By Team DeadlineTech
+
+# Exercises RangedDownloader against a local aiohttp server standing in for the CDN.
+# The module is loaded from its file so the bot package (and its clients) isn't started.
+
+import asyncio
+import importlib.util
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load(name: str, path: Path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())  # DeadlineTech.logging opens log.txt in the working directory
+try:
+    if "DeadlineTech.logging" not in sys.modules:
+        _load("DeadlineTech.logging", ROOT / "DeadlineTech" / "logging.py")
+    downloader = _load("deadline_downloader", ROOT / "DeadlineTech" / "utils" / "downloader.py")
+finally:
+    os.chdir(_cwd)
+
+PAYLOAD = bytes(range(256)) * 4096  # 1 MiB
+
+
+def _ranged(request, data):
+    header = request.headers.get("Range")
+    if not header:
+        return web.Response(body=data)
+    start, _, end = header[len("bytes="):].partition("-")
+    start, end = int(start), int(end) if end else len(data) - 1
+    return web.Response(
+        status=206,
+        body=data[start : end + 1],
+        headers={"Content-Range": f"bytes {start}-{end}/{len(data)}"},
+    )
+
+
+async def _cut_off(request):
+    # Sends half the payload a piece at a time, then drops the connection
+    resp = web.StreamResponse(headers={"Content-Length": str(len(PAYLOAD))})
+    await resp.prepare(request)
+    for start in range(0, len(PAYLOAD) // 2, 64 * 1024):
+        await resp.write(PAYLOAD[start : start + 64 * 1024])
+        await asyncio.sleep(0.01)
+    request.transport.close()
+    return resp
+
+
+class StandIn:
+    def __init__(self):
+        self.ranges = []
+        self.drops = 1
+        self.failing_start = None
+
+    async def drop(self, request):
+        # No Accept-Ranges header, and the first response dies halfway through
+        self.ranges.append(request.headers.get("Range"))
+        if self.drops and "Range" not in request.headers:
+            self.drops -= 1
+            return await _cut_off(request)
+        return _ranged(request, PAYLOAD)
+
+    async def ignores_range(self, request):
+        self.ranges.append(request.headers.get("Range"))
+        if self.drops:
+            self.drops -= 1
+            return await _cut_off(request)
+        return web.Response(body=PAYLOAD)
+
+    async def segmented(self, request):
+        if request.method == "HEAD":
+            return web.Response(headers={"Accept-Ranges": "bytes", "Content-Length": str(len(PAYLOAD))})
+        self.ranges.append(request.headers.get("Range"))
+        if self.failing_start is not None and request.headers.get("Range", "").startswith(f"bytes={self.failing_start}-"):
+            return web.Response(status=500)
+        await asyncio.sleep(0.05)
+        return _ranged(request, PAYLOAD)
+
+
+async def _serve(standin: StandIn):
+    app = web.Application()
+    app.router.add_get("/drop", standin.drop)
+    app.router.add_get("/ignores-range", standin.ignores_range)
+    app.router.add_route("*", "/segmented", standin.segmented)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def _run(test, **options):
+    async def main():
+        import aiohttp
+
+        standin = StandIn()
+        runner, base = await _serve(standin)
+        session = aiohttp.ClientSession()
+
+        async def factory():
+            return session
+
+        fetcher = downloader.RangedDownloader(factory, retry_delay=0, chunk_size=64 * 1024, **options)
+        try:
+            with tempfile.TemporaryDirectory() as folder:
+                await test(fetcher, standin, base, Path(folder))
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_resumes_after_dropped_connection():
+    async def test(fetcher, standin, base, folder):
+        out = folder / "song.webm"
+        assert await fetcher.fetch(f"{base}/drop", str(out))
+        assert out.read_bytes() == PAYLOAD
+        assert standin.ranges[0] is None
+        resumed_at = int(standin.ranges[1][len("bytes="):-1])
+        assert 0 < resumed_at <= len(PAYLOAD) // 2
+        assert fetcher.recent[-1].resumes == 1
+
+    _run(test)
+
+
+def test_starts_over_when_range_is_ignored():
+    async def test(fetcher, standin, base, folder):
+        out = folder / "song.webm"
+        assert await fetcher.fetch(f"{base}/ignores-range", str(out))
+        assert out.read_bytes() == PAYLOAD
+
+    _run(test)
+
+
+def test_segmented_download():
+    async def test(fetcher, standin, base, folder):
+        out = folder / "song.webm"
+        assert await fetcher.fetch(f"{base}/segmented", str(out))
+        assert out.read_bytes() == PAYLOAD
+        assert fetcher.recent[-1].segments == 4
+        assert len(standin.ranges) == 4
+
+    _run(test, connections=4, parallel_min_size=1)
+
+
+def test_segment_failure_stops_the_other_segments():
+    async def test(fetcher, standin, base, folder):
+        standin.failing_start = len(PAYLOAD) // 4
+        out = folder / "song.webm"
+        assert not await fetcher.fetch(f"{base}/segmented", str(out))
+        assert not out.exists()
+        assert not Path(fetcher.part_path(str(out))).exists()
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        assert not [task for task in pending if "_fetch_segment" in repr(task)]
+
+    _run(test, connections=4, parallel_min_size=1, retries=2)